@@ -0,0 +1,54 @@
+"""
+Script to check every backend against the reference over random scenes and record their
+throughput in charge-point interactions per second.
+You can use this as a script executed from the root of the repository. Pass a previous report
+as --baseline to also find kernel throughput regressions, the exit code is 1 on any failure.
+"""
+import argparse
+import json
+import sys
+
+from src.report.backend_matrix import BackendMatrix, throughput_regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--charge-counts', type=int, nargs='+', default=[1, 4, 16],
+                        help='number of charges of the random scenes.')
+    parser.add_argument('--grid-sizes', type=int, nargs='+', default=[9, 32],
+                        help='number of elements of each grid axis.')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random scenes.')
+    parser.add_argument('--tolerance', type=float, default=1e-4,
+                        help='maximum difference of the log10 magnitudes.')
+    parser.add_argument('--number-of-cores', type=int, default=1024,
+                        help='maximum number of threads per block of the parallel backend.')
+    parser.add_argument('--output', default='backend_matrix.json', help='json report file.')
+    parser.add_argument('--baseline', default=None, help='json report of a previous run.')
+    parser.add_argument('--min-ratio', type=float, default=0.8,
+                        help='minimum kernel throughput ratio to the baseline.')
+    args = parser.parse_args()
+
+    backend_matrix = BackendMatrix(
+        charge_counts=args.charge_counts, grid_sizes=args.grid_sizes, seed=args.seed,
+        tolerance=args.tolerance,
+        backend_kwargs={'parallel': {'number_of_cores': args.number_of_cores}})
+    report = backend_matrix.run()
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            report['regressions'] = throughput_regressions(
+                report, json.load(baseline_file), args.min_ratio)
+    with open(args.output, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+
+    print(json.dumps(report['backends'], indent=2))
+    for record in report['records']:
+        if not record['passed']:
+            print(f'FAILED {record["backend"]} {record["scene"]}: '
+                  f'{record.get("error", record.get("max_error"))}')
+    if report.get('regressions'):
+        print(f'Throughput regressions: {report["regressions"]}')
+    sys.exit(0 if report['passed'] and not report.get('regressions') else 1)
+
+
+if __name__ == '__main__':
+    main()
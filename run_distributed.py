@@ -0,0 +1,65 @@
+"""
+Script to calculate an electric field job split in tiles across TCP workers.
+Start a worker on each node:
+    python run_distributed.py worker --host 0.0.0.0 --port 5555
+and the coordinator with the job json file and the worker addresses:
+    python run_distributed.py coordinator job.json result.npz --workers node1:5555 node2:5555
+The coordinator can also start local workers for a single machine run:
+    python run_distributed.py coordinator job.json result.npz --local-workers 4
+You can use this as a script executed from the root of the repository.
+"""
+import argparse
+import json
+
+from numpy import savez_compressed
+
+from src.backends import BACKENDS
+from src.batch.job import Job
+from src.distributed.coordinator import Coordinator
+from src.distributed.worker import LocalWorkers, TileWorker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    subparsers = parser.add_subparsers(dest='role', required=True)
+
+    worker_parser = subparsers.add_parser('worker', help='calculate tiles sent by coordinators.')
+    worker_parser.add_argument('--host', default='127.0.0.1', help='address to listen on.')
+    worker_parser.add_argument('--port', type=int, default=5555, help='port to listen on.')
+    worker_parser.add_argument('--backend', default='parallel', choices=list(BACKENDS),
+                               help='backend of the jobs that do not define one.')
+    worker_parser.add_argument('--tuning-table', default=None, help='CudaAutotuner json table.')
+
+    coordinator_parser = subparsers.add_parser('coordinator', help='split a job across workers.')
+    coordinator_parser.add_argument('job_file', help='json file with the job.')
+    coordinator_parser.add_argument('output_file', help='npz file of the result.')
+    coordinator_parser.add_argument('--workers', nargs='*', default=[],
+                                    help='host:port address of each worker.')
+    coordinator_parser.add_argument('--local-workers', type=int, default=0,
+                                    help='number of workers started on this machine.')
+    coordinator_parser.add_argument('--backend', default='parallel', choices=list(BACKENDS),
+                                    help='backend of the local workers.')
+    coordinator_parser.add_argument('--tile-size', type=int, default=64,
+                                    help='rows and columns of each tile.')
+    args = parser.parse_args()
+
+    if args.role == 'worker':
+        worker = TileWorker(args.host, args.port, args.backend, args.tuning_table)
+        print(f'Worker listening on {worker.address[0]}:{worker.address[1]}')
+        worker.serve_forever()
+        return
+
+    with open(args.job_file) as job_file:
+        job = Job.from_json(job_file.read(), default_job_id='job')
+    workers = [(host, int(port)) for host, port in
+               (address.rsplit(':', 1) for address in args.workers)]
+    with LocalWorkers(args.local_workers, args.backend) as local_workers:
+        coordinator = Coordinator(workers + local_workers.addresses,
+                                  (args.tile_size, args.tile_size), backend=job.backend)
+        result, x, y, report = coordinator.calculate(job.config_option, job.charges)
+    savez_compressed(args.output_file, result=result, x=x, y=y)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Script to run a queue of electric field jobs described in a json lines file.
+Each line is a job like:
+    {"id": "dipole", "config": {"elements_between_limits": 200},
+     "charges": [{"type": "PointChargeFlatland", "q": 1, "x": [-1, 0]},
+                 {"type": "LineCharge", "q": -1, "x1": [1, -1], "x2": [1, 1]}]}
+You can use this as a script executed from the root of the repository, running it again with the
+same output directory resumes an interrupted run.
+"""
+import argparse
+import json
+
+from src.backends import BACKENDS
+from src.batch.job import Job
+from src.batch.job_runner import JobRunner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('jobs_file', help='json lines file with one job per line.')
+    parser.add_argument('output_dir', help='directory of the result store.')
+    parser.add_argument('--processes', type=int, default=1, help='number of worker processes.')
+    parser.add_argument('--backend', default='parallel', choices=list(BACKENDS),
+                        help='backend of the jobs that do not define one.')
+    parser.add_argument('--tuning-table', default=None, help='CudaAutotuner json table.')
+    args = parser.parse_args()
+
+    jobs = Job.from_jsonl_file(args.jobs_file)
+    job_runner = JobRunner(args.output_dir, args.processes, args.backend, args.tuning_table)
+    report = job_runner.run(jobs)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,14 @@
 """Root"""
 from .sequential_electric_field import SequentialElectricField
 from .parallel_electric_field import ParallelElectricField
+from .particle_simulation import ParticleSimulation
+from .mutual_interaction import MutualInteraction
+from .volume_electric_field import VolumeElectricField
 
 __all__ = [
     'SequentialElectricField',
     'ParallelElectricField',
+    'ParticleSimulation',
+    'MutualInteraction',
+    'VolumeElectricField',
 ]
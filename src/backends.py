@@ -0,0 +1,26 @@
+"""
+Registry of the electric field backends.
+"""
+from src.sequential_electric_field import SequentialElectricField
+from src.parallel_electric_field import ParallelElectricField
+
+BACKENDS = {
+    'sequential': SequentialElectricField,
+    'parallel': ParallelElectricField,
+}
+
+
+def create_backend(name, config_option, charges, **kwargs):
+    """
+    Create an electric field backend by its registered name.
+    Arguments:
+        name(str): registered backend name.
+        config_option(object): ConfigOption object with the configuration values.
+        charges(list): electric charges that generate the Electric Field.
+        kwargs(dict): extra arguments of the backend constructor.
+    Returns:
+        object: electric field backend.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown backend {name}, use one of {tuple(BACKENDS)}.')
+    return BACKENDS[name](config_option, charges, **kwargs)
@@ -0,0 +1,8 @@
+"""Batch package."""
+from .job import Job
+from .job_runner import JobRunner
+
+__all__ = [
+    'Job',
+    'JobRunner',
+]
@@ -0,0 +1,128 @@
+"""
+Class to abstract an electric field calculation job.
+"""
+import json
+from math import pi
+
+from electrostatics import LineCharge, PointCharge, PointChargeFlatland
+
+from src.helper.config_option import ConfigOption
+from src.helper.segment_charges import Arc, Polygon, Polyline
+
+
+class Job():
+    """
+    Abstraction for a calculation job.
+    Args:
+        job_id(str): unique job identifier, used as result file name.
+        config_option(object): ConfigOption object with the configuration values.
+        charges(list): electric charges that generate the Electric Field.
+        backend(str): registered backend name, None uses the runner default.
+    """
+
+    @property
+    def job_id(self):
+        """Unique job identifier."""
+        return self.__job_id
+
+    @property
+    def config_option(self):
+        """ConfigOption object with the configuration values."""
+        return self.__config_option
+
+    @property
+    def charges(self):
+        """Electric charges that generate the Electric Field."""
+        return self.__charges
+
+    @property
+    def backend(self):
+        """Registered backend name."""
+        return self.__backend
+
+    def __init__(self, job_id, config_option, charges, backend=None):
+        self.__job_id = str(job_id)
+        self.__config_option = config_option
+        self.__charges = charges
+        self.__backend = backend
+
+    def __str__(self):
+        return f'Job {self.job_id}: {len(self.charges)} charges{self.config_option}'
+
+    @classmethod
+    def from_dict(cls, job_as_dict, default_job_id=None):
+        """
+        Create a Job object based on a dict.
+        The charges are dicts with a 'type' key (PointCharge, PointChargeFlatland, LineCharge,
+        Polyline, Polygon or Arc), 'q' and the positions 'x' for point charges, 'x1' and 'x2' for
+        line charges, 'vertices' for polylines and polygons or 'center', 'radius', 'start_angle',
+        'end_angle' and 'number_of_segments' for arcs.
+        """
+        return cls(
+            job_id=job_as_dict.get('id', default_job_id),
+            config_option=ConfigOption.from_dict(job_as_dict.get('config', {})),
+            charges=[charge_from_dict(charge) for charge in job_as_dict.get('charges', [])],
+            backend=job_as_dict.get('backend')
+        )
+
+    def to_dict(self):
+        """Dict with the job values, the inverse of from_dict."""
+        job_as_dict = {
+            'id': self.job_id,
+            'config': self.config_option.to_dict(),
+            'charges': [charge_to_dict(charge) for charge in self.charges],
+        }
+        if self.backend is not None:
+            job_as_dict['backend'] = self.backend
+        return job_as_dict
+
+    @classmethod
+    def from_json(cls, job_as_json_string, default_job_id=None):
+        """Create a Job object based on a json string."""
+        return cls.from_dict(json.loads(job_as_json_string), default_job_id)
+
+    @classmethod
+    def from_jsonl_file(cls, file_path):
+        """Create the Job objects of a json lines file, one job per non empty line."""
+        with open(file_path) as jobs_file:
+            return [cls.from_json(line, default_job_id=f'job_{line_number}')
+                    for line_number, line in enumerate(jobs_file) if line.strip()]
+
+
+def charge_from_dict(charge_as_dict):
+    """Create an electrostatics charge based on a dict."""
+    charge_type = charge_as_dict.get('type', 'PointChargeFlatland')
+    if charge_type == 'PointCharge':
+        return PointCharge(charge_as_dict['q'], charge_as_dict['x'])
+    if charge_type == 'PointChargeFlatland':
+        return PointChargeFlatland(charge_as_dict['q'], charge_as_dict['x'])
+    if charge_type == 'LineCharge':
+        return LineCharge(charge_as_dict['q'], charge_as_dict['x1'], charge_as_dict['x2'])
+    if charge_type == 'Polyline':
+        return Polyline(charge_as_dict['q'], charge_as_dict['vertices'])
+    if charge_type == 'Polygon':
+        return Polygon(charge_as_dict['q'], charge_as_dict['vertices'])
+    if charge_type == 'Arc':
+        return Arc(charge_as_dict['q'], charge_as_dict['center'], charge_as_dict['radius'],
+                   charge_as_dict.get('start_angle', 0), charge_as_dict.get('end_angle', 2*pi),
+                   charge_as_dict.get('number_of_segments', 32))
+    raise ValueError(f'Unknown charge type {charge_type}.')
+
+
+def charge_to_dict(charge):
+    """
+    Create a dict of an electrostatics charge, the inverse of charge_from_dict.
+    Arcs are stored as polylines with the same vertices, that have the same Electric Field.
+    """
+    if isinstance(charge, PointChargeFlatland):
+        return {'type': 'PointChargeFlatland', 'q': float(charge.q), 'x': charge.x.tolist()}
+    if isinstance(charge, PointCharge):
+        return {'type': 'PointCharge', 'q': float(charge.q), 'x': charge.x.tolist()}
+    if isinstance(charge, LineCharge):
+        return {'type': 'LineCharge', 'q': float(charge.q), 'x1': charge.x1.tolist(),
+                'x2': charge.x2.tolist()}
+    if isinstance(charge, Polygon):
+        return {'type': 'Polygon', 'q': float(charge.q), 'vertices': charge.vertices[:-1].tolist()}
+    if isinstance(charge, Polyline):
+        return {'type': 'Polyline', 'q': float(charge.q), 'vertices': charge.vertices.tolist()}
+    raise ValueError(f'Unknown charge type {type(charge).__name__}.')
@@ -0,0 +1,153 @@
+"""
+Runner of a queue of electric field calculation jobs over a process pool.
+
+Each job result is written as <job_id>.npz (result, x and y matrices) in the output directory and
+registered in the index.jsonl file only after the npz file is complete, so an interrupted run
+can be resumed skipping the jobs already in the index.
+"""
+import json
+import re
+from multiprocessing import get_context
+from os import SEEK_END, makedirs, path, replace
+from time import time
+
+from numpy import savez_compressed
+
+from src.backends import create_backend
+from src.helper.cuda_autotuner import CudaAutotuner
+
+INDEX_FILE_NAME = 'index.jsonl'
+JOB_ID_PATTERN = re.compile(r'[\w.-]+')
+
+# Per-worker state, created once by the pool initializer and reused by every job of the worker.
+_worker_state = {}
+
+
+class JobRunner():
+    """
+    Run calculation jobs across a process pool and store their results.
+    Args:
+        output_dir(str): directory of the result store.
+        processes(int): number of worker processes, 0 runs the jobs in the current process.
+        backend(str): registered backend name used by jobs that do not define one.
+        tuning_table_path(str): CudaAutotuner json table shared by the parallel backend jobs.
+    """
+
+    @property
+    def index_path(self):
+        """Path of the result store index file."""
+        return path.join(self._output_dir, INDEX_FILE_NAME)
+
+    def __init__(self, output_dir, processes=1, backend='parallel', tuning_table_path=None):
+        self._output_dir = output_dir
+        self._processes = processes
+        self._backend = backend
+        self._tuning_table_path = tuning_table_path
+
+    def completed_jobs(self):
+        """Identifiers of the jobs whose result is already in the store."""
+        if not path.exists(self.index_path):
+            return set()
+        completed = set()
+        with open(self.index_path) as index_file:
+            for line in index_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line may be truncated by an interruption.
+                    continue
+                if path.exists(path.join(self._output_dir, entry['file'])):
+                    completed.add(entry['job_id'])
+        return completed
+
+    def run(self, jobs):
+        """
+        Run the jobs that are not in the result store yet.
+        Arguments:
+            jobs(list): Job objects.
+        Returns:
+            dict: execution report with the job throughput.
+        """
+        _validate_job_ids(jobs)
+        makedirs(self._output_dir, exist_ok=True)
+        completed = self.completed_jobs()
+        pending = [(job, job.backend or self._backend) for job in jobs
+                   if job.job_id not in completed]
+
+        start_time = time()
+        entries = []
+        self._terminate_index()
+        with open(self.index_path, 'a') as index_file:
+            for entry in self._map(pending):
+                index_file.write(json.dumps(entry) + '\n')
+                index_file.flush()
+                entries.append(entry)
+        total_time = time() - start_time
+
+        points = sum(entry['points'] for entry in entries)
+        return {
+            'total_time': total_time,
+            'jobs': len(jobs),
+            'completed_jobs': len(entries),
+            'skipped_jobs': len(jobs) - len(pending),
+            'jobs_per_second': len(entries) / total_time if total_time else 0,
+            'points_per_second': points / total_time if total_time else 0,
+        }
+
+    def _terminate_index(self):
+        # An interruption may leave a partial last line, new entries must not be appended to it.
+        if not path.exists(self.index_path) or not path.getsize(self.index_path):
+            return
+        with open(self.index_path, 'rb+') as index_file:
+            index_file.seek(-1, SEEK_END)
+            if index_file.read(1) != b'\n':
+                index_file.write(b'\n')
+
+    def _map(self, pending):
+        arguments = [(job, backend, self._output_dir) for job, backend in pending]
+        if self._processes == 0:
+            _init_worker(self._tuning_table_path)
+            yield from map(_run_job, arguments)
+            return
+        # Spawned workers, a forked process can not use the cuda context of its parent.
+        context = get_context('spawn')
+        with context.Pool(self._processes, _init_worker, (self._tuning_table_path,)) as pool:
+            yield from pool.imap_unordered(_run_job, arguments)
+
+
+def _validate_job_ids(jobs):
+    # Job ids are used as result file names inside the output directory.
+    job_ids = set()
+    for job in jobs:
+        if not JOB_ID_PATTERN.fullmatch(job.job_id) or not job.job_id.strip('.'):
+            raise ValueError(f'Job id {job.job_id!r} is not a valid file name, use letters, '
+                             'digits, "_", "-" and ".".')
+        if job.job_id in job_ids:
+            raise ValueError(f'Duplicate job id {job.job_id!r}.')
+        job_ids.add(job.job_id)
+
+
+def _init_worker(tuning_table_path):
+    _worker_state['autotuner'] = CudaAutotuner(tuning_table_path)
+
+
+def _run_job(arguments):
+    job, backend, output_dir = arguments
+    kwargs = {'autotuner': _worker_state['autotuner']} if backend == 'parallel' else {}
+    electric_field = create_backend(backend, job.config_option, job.charges, **kwargs)
+
+    start_time = time()
+    result, x, y = electric_field.calculate()
+    calculation_time = time() - start_time
+
+    file_name = f'{job.job_id}.npz'
+    temporary_path = path.join(output_dir, f'{job.job_id}.tmp.npz')
+    savez_compressed(temporary_path, result=result, x=x, y=y)
+    replace(temporary_path, path.join(output_dir, file_name))
+    return {
+        'job_id': job.job_id,
+        'file': file_name,
+        'backend': backend,
+        'points': int(result.size),
+        'calculation_time': calculation_time,
+    }
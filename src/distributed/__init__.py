@@ -0,0 +1,9 @@
+"""Distributed package."""
+from .coordinator import Coordinator
+from .worker import LocalWorkers, TileWorker
+
+__all__ = [
+    'Coordinator',
+    'LocalWorkers',
+    'TileWorker',
+]
@@ -0,0 +1,201 @@
+"""
+Coordinator of the distributed evaluation.
+
+The grid of a ConfigOption is split in tiles that are shared by the workers through a queue,
+so faster workers take more tiles. Each worker connection keeps a few tiles in flight to hide
+the network latency. When a worker fails, its tiles in flight go back to the queue and are
+calculated by the remaining workers.
+"""
+import socket
+from collections import deque
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import sleep, time
+
+from numpy import float32, meshgrid, zeros
+
+from src.batch.job import Job
+from src.distributed.protocol import decompress_tile, receive_message, send_message
+
+
+class Coordinator():
+    """
+    Split Electric Field calculations in tiles calculated by TileWorker servers.
+    Args:
+        workers(list): (host, port) address of each worker.
+        tile_shape(tuple): (rows, columns) of the tiles.
+        tiles_in_flight(int): maximum number of tiles sent to a worker and not answered yet.
+        timeout(float): seconds without an answer before a worker is considered failed.
+        backend(str): registered backend name of the workers, None uses the worker default.
+    """
+
+    def __init__(self, workers, tile_shape=(64, 64), tiles_in_flight=2, timeout=60,
+                 backend=None):
+        self._workers = [tuple(worker) for worker in workers]
+        self._tile_shape = tile_shape
+        self._tiles_in_flight = tiles_in_flight
+        self._timeout = timeout
+        self._backend = backend
+        self._lock = Lock()
+
+    def tiles(self, config_option):
+        """
+        Split the grid of a ConfigOption in tiles.
+        Arguments:
+            config_option(object): ConfigOption object with the configuration values.
+        Returns:
+            list: (tile_id, (row_start, row_stop), (column_start, column_stop)) of each tile.
+        """
+        rows, columns = len(config_option.y_axis), len(config_option.x_axis)
+        tile_rows, tile_columns = self._tile_shape
+        return [(tile_id, (row, min(row + tile_rows, rows)),
+                 (column, min(column + tile_columns, columns)))
+                for tile_id, (row, column) in enumerate(
+                    (row, column) for row in range(0, rows, tile_rows)
+                    for column in range(0, columns, tile_columns))]
+
+    def calculate(self, config_option, charges):
+        """
+        Calculate the matrix with Electric Field values across the workers.
+        Arguments:
+            config_option(object): ConfigOption object with the configuration values.
+            charges(list): electric charges that generate the Electric Field.
+        Returns:
+            numpy.array: matrix with calculated results.
+            x: matrix with x-axis values.
+            y: matrix with y-axis values.
+            dict: execution report with the throughput and load balance of the workers.
+        """
+        x, y = meshgrid(config_option.x_axis, config_option.y_axis)
+        result = zeros(x.shape, dtype=float32)
+        tiles = self.tiles(config_option)
+        queue = Queue()
+        for tile in tiles:
+            queue.put(tile)
+        job = Job('distributed', config_option, charges, self._backend).to_dict()
+        state = {'remaining': len(tiles), 'outstanding': 0, 'done': set()}
+        reports = [_new_worker_report(worker) for worker in self._workers]
+
+        start_time = time()
+        threads = [Thread(target=self._serve_worker,
+                          args=(worker, job, queue, result, state, report), daemon=True)
+                   for worker, report in zip(self._workers, reports)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        total_time = time() - start_time
+
+        if state['remaining']:
+            raise RuntimeError(f'{state["remaining"]} of {len(tiles)} tiles missing, every worker '
+                               'failed or the tiles were lost.')
+        return result, x, y, _report(reports, result.size, len(tiles), total_time)
+
+    def _serve_worker(self, worker, job, queue, result, state, report):
+        in_flight = deque()
+        start_time = time()
+        try:
+            with socket.create_connection(worker, self._timeout) as connection:
+                send_message(connection, {'type': 'scene', 'job': job})
+                receive_message(connection)
+                while self._pending(state) or in_flight:
+                    self._send_tiles(connection, queue, in_flight, state)
+                    if not in_flight:
+                        if self._lost_tiles(queue, state):
+                            break
+                        continue
+                    header, payload = receive_message(connection)
+                    tile_id, rows, columns = in_flight[0]
+                    if header.get('tile_id') != tile_id:
+                        raise ValueError(f'Expected tile {tile_id}, got {header.get("tile_id")}.')
+                    self._store_tile(tile_id, decompress_tile(header, payload), rows, columns,
+                                     result, state)
+                    in_flight.popleft()
+                    report['tiles'] += 1
+                    report['points'] += (rows[1] - rows[0]) * (columns[1] - columns[0])
+                    report['calculation_time'] += header.get('calculation_time', 0)
+                    report['received_bytes'] += len(payload)
+                send_message(connection, {'type': 'close'})
+        except Exception as error:  # pylint: disable=broad-except
+            # Covers refused connections, timeouts, connections closed by the worker and corrupt
+            # answers, the tiles in flight must go back to the queue whatever the failure is.
+            report['failed'] = True
+            report['error'] = repr(error)
+            with self._lock:
+                for tile in in_flight:
+                    queue.put(tile)
+                state['outstanding'] -= len(in_flight)
+        report['wall_time'] = time() - start_time
+
+    def _send_tiles(self, connection, queue, in_flight, state):
+        while len(in_flight) < self._tiles_in_flight:
+            # Tiles are taken and counted as outstanding at once, so a tile is always either in
+            # the queue or outstanding until it is stored.
+            with self._lock:
+                try:
+                    tile = queue.get_nowait()
+                except Empty:
+                    tile = None
+                else:
+                    if tile[0] in state['done']:
+                        continue
+                    state['outstanding'] += 1
+            if tile is None:
+                if not in_flight:
+                    # Waits a little when the queue is empty but tiles of other workers may fail.
+                    sleep(0.05)
+                return
+            tile_id, rows, columns = tile
+            in_flight.append(tile)
+            send_message(connection, {'type': 'tile', 'tile_id': tile_id, 'rows': rows,
+                                      'columns': columns})
+
+    def _store_tile(self, tile_id, tile, rows, columns, result, state):
+        if tile.shape != (rows[1] - rows[0], columns[1] - columns[0]):
+            raise ValueError(f'Tile {tile_id} with shape {tile.shape} does not fit its range.')
+        result[rows[0]:rows[1], columns[0]:columns[1]] = tile
+        with self._lock:
+            state['outstanding'] -= 1
+            if tile_id not in state['done']:
+                state['done'].add(tile_id)
+                state['remaining'] -= 1
+
+    def _pending(self, state):
+        with self._lock:
+            return state['remaining'] > 0
+
+    def _lost_tiles(self, queue, state):
+        # Missing tiles that are neither queued nor in flight would never be calculated.
+        with self._lock:
+            return state['remaining'] > 0 and not state['outstanding'] and queue.empty()
+
+
+def _new_worker_report(worker):
+    return {
+        'worker': f'{worker[0]}:{worker[1]}',
+        'tiles': 0,
+        'points': 0,
+        'received_bytes': 0,
+        'calculation_time': 0,
+        'wall_time': 0,
+        'failed': False,
+    }
+
+
+def _report(reports, points, number_of_tiles, total_time):
+    for report in reports:
+        report['points_per_second'] = (report['points'] / report['wall_time']
+                                       if report['wall_time'] else 0)
+    healthy = [report['points'] for report in reports if not report['failed']]
+    # Mean over maximum share of the points, 1 when every healthy worker did the same work.
+    load_balance = sum(healthy) / (len(healthy) * max(healthy)) if healthy and max(healthy) else 0
+    received_bytes = sum(report['received_bytes'] for report in reports)
+    return {
+        'total_time': total_time,
+        'tiles': number_of_tiles,
+        'points_per_second': points / total_time if total_time else 0,
+        'load_balance': load_balance,
+        'compression_ratio': points * float32().nbytes / received_bytes if received_bytes else 0,
+        'failed_workers': sum(report['failed'] for report in reports),
+        'workers': reports,
+    }
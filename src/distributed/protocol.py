@@ -0,0 +1,77 @@
+"""
+Messages exchanged by the coordinator and the workers over TCP.
+
+Each message is a json header followed by an optional binary payload, prefixed by the byte sizes
+of both parts. Result tiles travel as zlib compressed float32 buffers described by the header.
+"""
+import json
+import struct
+import zlib
+
+from numpy import float32, frombuffer
+
+_SIZES = struct.Struct('!II')
+
+COMPRESSION_LEVEL = 1
+
+
+def send_message(connection, header, payload=b''):
+    """
+    Send a message through a socket.
+    Arguments:
+        connection(socket): connected socket.
+        header(dict): json serializable message header, 'type' key is the message type.
+        payload(bytes): binary content of the message.
+    """
+    header_bytes = json.dumps(header).encode()
+    connection.sendall(_SIZES.pack(len(header_bytes), len(payload)) + header_bytes + payload)
+
+
+def receive_message(connection):
+    """
+    Receive a message sent by send_message.
+    Arguments:
+        connection(socket): connected socket.
+    Returns:
+        dict: message header.
+        bytes: binary content of the message.
+    """
+    header_size, payload_size = _SIZES.unpack(_receive_exactly(connection, _SIZES.size))
+    header = json.loads(_receive_exactly(connection, header_size))
+    return header, _receive_exactly(connection, payload_size)
+
+
+def compress_tile(tile):
+    """
+    Compress a result tile.
+    Arguments:
+        tile(numpy.array): 2-D matrix with calculated results.
+    Returns:
+        dict: header fields needed to decompress the tile.
+        bytes: compressed tile.
+    """
+    payload = zlib.compress(tile.astype(float32).tobytes(), COMPRESSION_LEVEL)
+    return {'shape': list(tile.shape)}, payload
+
+
+def decompress_tile(header, payload):
+    """
+    Decompress a result tile.
+    Arguments:
+        header(dict): message header with the shape of the tile.
+        payload(bytes): compressed tile.
+    Returns:
+        numpy.array: 2-D matrix with calculated results.
+    """
+    return frombuffer(zlib.decompress(payload), dtype=float32).reshape(header['shape'])
+
+
+def _receive_exactly(connection, size):
+    chunks = []
+    while size:
+        chunk = connection.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError('Connection closed in the middle of a message.')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
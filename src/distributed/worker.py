@@ -0,0 +1,136 @@
+"""
+Worker of the distributed evaluation, it calculates the tiles sent by a coordinator.
+
+A coordinator connection starts with a 'scene' message holding the job dict. Each following
+'tile' message has the row and column ranges of a tile, answered with a 'result' message with
+the compressed tile. A 'close' message or the end of the connection finishes it.
+"""
+import socketserver
+from multiprocessing import get_context
+from time import time
+
+from src.backends import create_backend
+from src.batch.job import Job
+from src.distributed.protocol import compress_tile, receive_message, send_message
+from src.helper.cuda_autotuner import CudaAutotuner
+
+
+class TileWorker():
+    """
+    TCP server that calculates tiles with a local backend.
+    Args:
+        host(str): address to listen on.
+        port(int): port to listen on, 0 picks a free port.
+        backend(str): registered backend name used by scenes that do not define one.
+        tuning_table_path(str): CudaAutotuner json table of the parallel backend.
+    """
+
+    @property
+    def address(self):
+        """(host, port) the worker is listening on."""
+        return self._server.server_address
+
+    def __init__(self, host='127.0.0.1', port=0, backend='parallel', tuning_table_path=None):
+        self._server = _TileServer((host, port), _TileRequestHandler)
+        self._server.backend = backend
+        self._server.autotuner = CudaAutotuner(tuning_table_path)
+
+    def serve_forever(self):
+        """Answer coordinators until shutdown is called."""
+        with self._server:
+            self._server.serve_forever()
+
+    def shutdown(self):
+        """Stop serve_forever, must be called from another thread."""
+        self._server.shutdown()
+
+
+class LocalWorkers():
+    """
+    TileWorker processes on this machine, used as a context manager.
+    Args:
+        number_of_workers(int): number of worker processes.
+        backend(str): registered backend name of the workers.
+        tuning_table_path(str): CudaAutotuner json table of the parallel backend.
+    """
+
+    @property
+    def addresses(self):
+        """(host, port) of each worker."""
+        return self._addresses
+
+    def __init__(self, number_of_workers, backend='parallel', tuning_table_path=None):
+        self._number_of_workers = number_of_workers
+        self._backend = backend
+        self._tuning_table_path = tuning_table_path
+        self._processes = []
+        self._addresses = []
+
+    def start(self):
+        """Start the worker processes and wait for their addresses."""
+        # Spawned workers, a forked process can not use the cuda context of its parent.
+        context = get_context('spawn')
+        for _ in range(self._number_of_workers):
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_serve_local_worker,
+                args=(sender, self._backend, self._tuning_table_path), daemon=True)
+            process.start()
+            self._processes.append(process)
+            self._addresses.append(tuple(receiver.recv()))
+        return self
+
+    def stop(self):
+        """Terminate the worker processes."""
+        for process in self._processes:
+            process.terminate()
+            process.join()
+        self._processes, self._addresses = [], []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exception_info):
+        self.stop()
+
+
+class _TileServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _TileRequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        electric_field = None
+        while True:
+            try:
+                header, _ = receive_message(self.request)
+            except ConnectionError:
+                return
+            if header['type'] == 'scene':
+                electric_field = self._create_backend(Job.from_dict(header['job']))
+                send_message(self.request, {'type': 'ready'})
+            elif header['type'] == 'tile':
+                start_time = time()
+                tile = electric_field.calculate_tile(slice(*header['rows']),
+                                                     slice(*header['columns']))
+                calculation_time = time() - start_time
+                tile_header, payload = compress_tile(tile)
+                tile_header.update(type='result', tile_id=header['tile_id'],
+                                   calculation_time=calculation_time)
+                send_message(self.request, tile_header, payload)
+            else:
+                return
+
+    def _create_backend(self, job):
+        backend = job.backend or self.server.backend
+        kwargs = {'autotuner': self.server.autotuner} if backend == 'parallel' else {}
+        return create_backend(backend, job.config_option, job.charges, **kwargs)
+
+
+def _serve_local_worker(sender, backend, tuning_table_path):
+    worker = TileWorker('127.0.0.1', 0, backend, tuning_table_path)
+    sender.send(worker.address)
+    sender.close()
+    worker.serve_forever()
@@ -17,8 +17,12 @@ class ElectricFieldWrapper(ElectricField):
         """Calculate the field magnitude."""
         x, y = meshgrid(linspace(XMIN/ZOOM+XOFFSET, XMAX/ZOOM+XOFFSET, 200),
                         linspace(YMIN/ZOOM, YMAX/ZOOM, 200))
+        return self.magnitudes(x, y), x, y
+
+    def magnitudes(self, x, y):
+        """Calculate the field magnitude at the positions of the x and y matrices."""
         z = zeros_like(x)
         for i in range(x.shape[0]):
             for j in range(x.shape[1]):
                 z[i][j] = log10(self.magnitude([x[i][j], y[i][j]]))
-        return z, x, y
+        return z
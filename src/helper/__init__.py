@@ -1,11 +1,18 @@
 """Root"""
-from .config_option import ConfigOption
+from .config_option import ConfigOption, ConfigOption3D
+from .cuda_autotuner import CudaAutotuner
 from .cuda_helper import cuda_args, limited_cuda_args
 from .drawer import Drawer
+from .segment_charges import Arc, Polygon, Polyline
 
 __all__ = [
+    'Arc',
     'ConfigOption',
+    'ConfigOption3D',
+    'CudaAutotuner',
     'Drawer',
+    'Polygon',
+    'Polyline',
     'cuda_args',
     'limited_cuda_args',
 ]
@@ -0,0 +1,72 @@
+"""
+Packed array representation of the electrostatics charges.
+
+Each charge is a row with 7 columns: type (0 PointChargeFlatland, 1 PointCharge, 2 LineCharge),
+q, x0, y0, x1, y1 and lam. Point charges only use the first 4 columns. Segment charges
+(polylines, polygons and arcs) are packed as one LineCharge row per segment.
+"""
+from electrostatics import LineCharge, PointCharge, PointChargeFlatland
+from numpy import concatenate, float32, zeros
+
+from src.helper.segment_charges import Polyline
+
+
+def charge_rows(charge):
+    """Number of packed rows of a charge."""
+    return len(charge.vertices) - 1 if isinstance(charge, Polyline) else 1
+
+
+def charges_to_array(charges, dtype=float32):
+    """
+    Pack the charges in a single array.
+    Arguments:
+        charges(list): electric charges.
+        dtype(object): numpy type of the array.
+    Returns:
+        numpy.array: (N, 7) packed charges.
+    """
+    chagres_array = zeros((sum(charge_rows(charge) for charge in charges), 7), dtype=dtype)
+    i = 0
+    for charge in charges:
+        if isinstance(charge, Polyline):
+            for line_charge in charge.to_line_charges():
+                chagres_array[i] = _line_charge_row(line_charge)
+                i += 1
+            continue
+        if isinstance(charge, PointCharge) or isinstance(charge, PointChargeFlatland):
+            chagres_array[i][0] = 0 if isinstance(charge, PointChargeFlatland) else 1
+            chagres_array[i][1] = charge.q
+            chagres_array[i][2] = charge.x[0]
+            chagres_array[i][3] = charge.x[1]
+            chagres_array[i][4], chagres_array[i][5], chagres_array[i][6] = 0, 0, 0
+        if isinstance(charge, LineCharge):
+            chagres_array[i] = _line_charge_row(charge)
+        i += 1
+    return chagres_array
+
+
+def polylines_to_arrays(polylines, dtype=float32):
+    """
+    Pack the segment charges keeping their shared vertices.
+    Arguments:
+        polylines(list): Polyline (or Polygon and Arc) objects.
+        dtype(object): numpy type of the arrays.
+    Returns:
+        numpy.array: (V, 2) vertices of every polyline, one after the other.
+        numpy.array: (P, 3) first vertex index, number of vertices and lam of each polyline.
+    """
+    polylines_array = zeros((len(polylines), 3), dtype=dtype)
+    first_vertex = 0
+    for i, polyline in enumerate(polylines):
+        polylines_array[i][0] = first_vertex
+        polylines_array[i][1] = len(polyline.vertices)
+        polylines_array[i][2] = polyline.lam
+        first_vertex += len(polyline.vertices)
+    if not polylines:
+        return zeros((0, 2), dtype=dtype), polylines_array
+    vertices = concatenate([polyline.vertices for polyline in polylines]).astype(dtype)
+    return vertices, polylines_array
+
+
+def _line_charge_row(charge):
+    return [2, charge.q, charge.x1[0], charge.x1[1], charge.x2[0], charge.x2[1], charge.lam]
@@ -112,6 +112,19 @@ class ConfigOption():
     def to_original_electrostatic_lib(self):
         return self.x_min, self.x_max, self.y_min, self.y_max, self.zoom, self.x_offset
 
+    def to_dict(self):
+        """Dict with the configuration values, the inverse of from_dict."""
+        return {
+            'x_min': self.x_min,
+            'x_max': self.x_max,
+            'x_offset': self.x_offset,
+            'y_min': self.y_min,
+            'y_max': self.y_max,
+            'y_offset': self.y_offset,
+            'zoom': self.zoom,
+            'elements_between_limits': self.elements_between_limits,
+        }
+
     @classmethod
     def from_dict(cls, configs_as_dict):
         """Create a ConfigOption object based on a dict."""
@@ -131,3 +144,73 @@ class ConfigOption():
         """Create a ConfigOption object based on a json string."""
         json_as_dict = json.loads(configs_as_json_string)
         return cls.from_dict(json_as_dict)
+
+
+class ConfigOption3D(ConfigOption):
+    """
+    Abstraction for config options of a volume, ConfigOption with a z-axis.
+    Args:
+        z_min(int): Minimum z-axis value.
+        z_max(int): Maximum z-axis value.
+        z_offset(int): Offset value for z-axis.
+        kwargs(dict): ConfigOption arguments.
+    """
+
+    @property
+    def z_min(self):
+        """Minimum z-axis value."""
+        return self.__z_min
+
+    @property
+    def z_max(self):
+        """Maximum z-axis value."""
+        return self.__z_max
+
+    @property
+    def z_offset(self):
+        """Offset value for z-axis."""
+        return self.__z_offset
+
+    @property
+    def z_axis(self):
+        """Z axis array."""
+        return linspace(
+            self.fixed_z_min, self.fixed_z_max, self.elements_between_limits, dtype=float32)
+
+    @property
+    def fixed_z_min(self):
+        """z_min fixed by zoom and offset."""
+        return self.z_min / self.zoom + self.z_offset
+
+    @property
+    def fixed_z_max(self):
+        """z_max fixed by zoom and offset."""
+        return self.z_max / self.zoom + self.z_offset
+
+    def __init__(self, z_min=-10, z_max=10, z_offset=0, **kwargs):
+        super().__init__(**kwargs)
+        self.__z_min = z_min
+        self.__z_max = z_max
+        self.__z_offset = z_offset
+
+    def __str__(self):
+        z_str = f'Z: [{self.z_min}, {self.z_max}] + {self.z_offset}'
+        return f'{super().__str__()[:-2]}\n {z_str} \n'
+
+    @classmethod
+    def from_dict(cls, configs_as_dict):
+        """Create a ConfigOption3D object based on a dict."""
+        config_option = ConfigOption.from_dict(configs_as_dict)
+        return cls(
+            x_min=config_option.x_min,
+            x_max=config_option.x_max,
+            x_offset=config_option.x_offset,
+            y_min=config_option.y_min,
+            y_max=config_option.y_max,
+            y_offset=config_option.y_offset,
+            z_min=configs_as_dict.get('z_min', -10),
+            z_max=configs_as_dict.get('z_max', 10),
+            z_offset=configs_as_dict.get('z_offset', 0),
+            zoom=config_option.zoom,
+            elements_between_limits=config_option.elements_between_limits
+        )
@@ -0,0 +1,232 @@
+"""
+Autotuner to choose the cuda block dimensions of each kernel launch.
+
+Candidate block shapes are ranked by an occupancy estimate, the best ranked ones are timed with
+the real kernel arguments and the winner is stored in a tuning table. Later launches of the same
+kernel with the same problem shape only look the block up in the table.
+"""
+import json
+from os import getpid, makedirs, path, replace
+from time import time
+
+try:
+    from fcntl import LOCK_EX, flock
+except ImportError:
+    # No file locks on Windows, concurrent saves may lose entries of each other.
+    flock = None
+
+from numba import cuda
+from numpy import array, ceil
+
+WARP_SIZE = 32
+MAX_BLOCK_DIMENSIONS = (1024, 1024, 64)
+PREFERRED_THREADS_PER_BLOCK = 256
+
+
+def next_power_of_two(value):
+    """Smallest power of two greater or equal to value."""
+    power = 1
+    while power < value:
+        power *= 2
+    return power
+
+
+def _product(values):
+    result = 1
+    for value in values:
+        result *= int(value)
+    return result
+
+
+def grid_for_block(shape, block):
+    """
+    Define the cuda grid that covers a problem shape with a given block.
+    Arguments:
+        shape(tuple): problem dimensions.
+        block(tuple): cuda block dimensions.
+    Return:
+        tuple: cuda grid dimensions.
+    """
+    return tuple(ceil(array(shape) / array(block)).astype(int))
+
+
+def occupancy_score(shape, block):
+    """
+    Estimate how much of the launched threads are useful work.
+    Arguments:
+        shape(tuple): problem dimensions.
+        block(tuple): cuda block dimensions.
+    Return:
+        float: value between 0 and 1, higher is better.
+    """
+    threads_per_block = _product(block)
+    launched_threads = _product(grid_for_block(shape, block)) * threads_per_block
+    padding_efficiency = _product(shape) / launched_threads
+    warps = int(ceil(threads_per_block / WARP_SIZE))
+    warp_efficiency = threads_per_block / (warps * WARP_SIZE)
+    return padding_efficiency * warp_efficiency
+
+
+def candidate_blocks(shape, number_of_kernels=1024):
+    """
+    List the block shapes worth timing, best occupancy estimate first.
+    Arguments:
+        shape(tuple): problem dimensions.
+        number_of_kernels(int): maximum number of threads per block.
+    Return:
+        list: cuda block dimensions.
+    """
+    options = []
+    for dimension, size in enumerate(shape):
+        limit = min(next_power_of_two(size), MAX_BLOCK_DIMENSIONS[dimension], number_of_kernels)
+        options.append([2**n for n in range(int(limit).bit_length()) if 2**n <= limit])
+
+    blocks = [()]
+    for dimension_options in options:
+        blocks = [block + (option,) for block in blocks for option in dimension_options
+                  if _product(block) * option <= number_of_kernels]
+
+    def rank(block):
+        threads_per_block = _product(block)
+        return (-occupancy_score(shape, block),
+                abs(threads_per_block - PREFERRED_THREADS_PER_BLOCK),
+                tuple(-value for value in block))
+    return sorted(blocks, key=rank)
+
+
+def register_limited_threads(kernel, number_of_kernels=1024):
+    """
+    Limit the number of threads per block by the register usage of a compiled kernel.
+    Arguments:
+        kernel(object): cuda kernel.
+        number_of_kernels(int): maximum number of threads per block.
+    Return:
+        int: number of threads per block that fits in the register file.
+    """
+    try:
+        registers_per_thread = kernel.get_regs_per_thread()
+        registers_per_block = cuda.get_current_device().MAX_REGISTERS_PER_BLOCK
+    except (AttributeError, TypeError, ValueError):
+        # The cuda simulator does not expose register usage.
+        return number_of_kernels
+    if not registers_per_thread:
+        return number_of_kernels
+    limit = registers_per_block // registers_per_thread // WARP_SIZE * WARP_SIZE
+    return max(WARP_SIZE, min(number_of_kernels, limit))
+
+
+class CudaAutotuner():
+    """
+    Search, time and cache the best cuda block shape for each kernel and problem shape.
+    Args:
+        table_path(str): json file used as persistent tuning table, None keeps it in memory.
+        repeats(int): number of timed launches of each candidate.
+        max_candidates(int): maximum number of candidates timed by the search.
+    """
+
+    @property
+    def table(self):
+        """Tuning table, maps a launch key to the winner block."""
+        return self.__table
+
+    def __init__(self, table_path=None, repeats=3, max_candidates=8):
+        self.__table_path = table_path
+        self.__repeats = repeats
+        self.__max_candidates = max_candidates
+        self.__table = self._load_table(table_path)
+
+    def launch_args(self, kernel, matrix, kernel_args, dimensions=2, number_of_kernels=1024):
+        """
+        Define the cuda args of a kernel, tuning it when the table has no entry for it.
+        Arguments:
+            kernel(object): cuda kernel to be launched.
+            matrix(object): array to be used as parallel process base.
+            kernel_args(tuple): arguments of the kernel, used to time the candidates.
+            dimensions(int): number of dimensions to be considered.
+            number_of_kernels(int): maximum number of threads per block.
+        Return:
+            tuple: cuda grid (system composed by multiple blocks) dimensions.
+            tuple: cuda block (parallel kernels) dimensions.
+        """
+        shape = tuple(int(value) for value in array(matrix.shape)[:dimensions])
+        key = self.key(kernel.py_func.__name__, shape, number_of_kernels)
+        block = self.__table.get(key)
+        if block is None:
+            def launch(grid, block):
+                kernel[grid, block](*kernel_args)
+            threads = register_limited_threads(kernel, number_of_kernels)
+            block = self.tune(key, shape, launch, threads)
+        block = tuple(block)
+        return grid_for_block(shape, block), block
+
+    def tune(self, key, shape, launch, number_of_kernels=1024):
+        """
+        Time the candidate blocks of a problem shape and store the fastest one.
+        Arguments:
+            key(str): tuning table key.
+            shape(tuple): problem dimensions.
+            launch(callable): function that receives grid and block and launches the kernel.
+            number_of_kernels(int): maximum number of threads per block.
+        Return:
+            tuple: cuda block dimensions of the fastest candidate.
+        """
+        candidates = candidate_blocks(shape, number_of_kernels)[:self.__max_candidates]
+        timings = [(self._time_launch(launch, grid_for_block(shape, block), block), block)
+                   for block in candidates]
+        best_block = min(timings, key=lambda timing: timing[0])[1]
+        self.__table[key] = list(best_block)
+        self.save()
+        return best_block
+
+    def save(self):
+        """Write the tuning table to its json file, if any."""
+        if self.__table_path is None:
+            return
+        directory = path.dirname(self.__table_path)
+        if directory:
+            makedirs(directory, exist_ok=True)
+        # The table may be shared by multiple processes, the entries stored by the others since
+        # it was loaded are merged under a lock and the merged table replaces the file at once.
+        with open(f'{self.__table_path}.lock', 'w') as lock_file:
+            if flock is not None:
+                flock(lock_file, LOCK_EX)
+            stored_table = self._load_table(self.__table_path)
+            stored_table.update(self.__table)
+            self.__table.update(stored_table)
+            temporary_path = f'{self.__table_path}.{getpid()}.tmp'
+            with open(temporary_path, 'w') as table_file:
+                json.dump(self.__table, table_file, indent=2, sort_keys=True)
+            replace(temporary_path, self.__table_path)
+
+    @staticmethod
+    def key(kernel_name, shape, number_of_kernels):
+        """Tuning table key of a kernel launch."""
+        shape_str = 'x'.join(str(value) for value in shape)
+        return f'{_device_name()}:{kernel_name}:{shape_str}:{number_of_kernels}'
+
+    def _time_launch(self, launch, grid, block):
+        # First launch is discarded, it may include the compilation time.
+        launch(grid, block)
+        cuda.synchronize()
+        best_time = float('inf')
+        for _ in range(self.__repeats):
+            start_time = time()
+            launch(grid, block)
+            cuda.synchronize()
+            best_time = min(best_time, time() - start_time)
+        return best_time
+
+    @staticmethod
+    def _load_table(table_path):
+        if table_path is None or not path.exists(table_path):
+            return {}
+        with open(table_path) as table_file:
+            return json.load(table_file)
+
+
+def _device_name():
+    try:
+        name = cuda.get_current_device().name
+    except AttributeError:
+        return 'simulator'
+    return name.decode() if isinstance(name, bytes) else name
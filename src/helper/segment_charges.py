@@ -0,0 +1,161 @@
+"""
+Charges made of connected line segments: polylines, polygons and arcs.
+
+The charge is uniformly distributed over the segments, so a segment charge is equivalent to one
+LineCharge per segment with the same linear density. The field of the whole segment charge is
+calculated in one batched pass: the distance from a point to each vertex is calculated once and
+shared by the two segments that meet at the vertex, and the angles of the LineCharge equations
+are replaced by their cosines, so no acos/cos is needed.
+"""
+from electrostatics import LineCharge
+from matplotlib import pyplot
+from numpy import (arange, array, asarray, concatenate, cos, float64, pi, sin, sqrt, stack,
+                   sum as array_sum, where)
+
+
+class Polyline():
+    """
+    Charge uniformly distributed over an open polyline.
+    Args:
+        q(float): total charge.
+        vertices(list): (V, 2) vertices of the polyline, V >= 2. Consecutive repeated vertices,
+            zero-length segments, are dropped.
+    """
+    R = 0.01
+
+    @property
+    def vertices(self):
+        """(V, 2) vertices, the first one is repeated at the end of closed polylines."""
+        return self._vertices
+
+    @property
+    def segments(self):
+        """(S, 2, 2) segments with their first and second vertices."""
+        return stack([self._vertices[:-1], self._vertices[1:]], axis=1)
+
+    @property
+    def length(self):
+        """Total length."""
+        return self._lengths.sum()
+
+    @property
+    def lam(self):
+        """Linear charge density."""
+        return self.q / self.length
+
+    def __init__(self, q, vertices):
+        self.q = q
+        self._vertices = _distinct_vertices(vertices)
+        if len(self._vertices) < 2:
+            raise ValueError('A polyline needs at least 2 distinct vertices.')
+        directions = self._vertices[1:] - self._vertices[:-1]
+        self._lengths = sqrt(array_sum(directions**2, axis=1))
+        self._directions = directions
+
+    def E(self, x):
+        """
+        Electric Field vector at position x.
+        Arguments:
+            x(list): (2,) position, or (..., 2) positions.
+        Returns:
+            numpy.array: (2,) or (..., 2) Electric Field vectors.
+        """
+        x = asarray(x, dtype=float64)
+        field_x, field_y = self.field(x[..., 0], x[..., 1])
+        return stack([field_x, field_y], axis=-1)
+
+    def field(self, x, y):
+        """
+        Electric Field of the whole polyline at the given positions.
+        Arguments:
+            x(numpy.array): x-axis values.
+            y(numpy.array): y-axis values, same shape of x.
+        Returns:
+            numpy.array: Ex values with the shape of x.
+            numpy.array: Ey values with the shape of x.
+        """
+        # Vectors from the positions to each vertex, shared by adjacent segments.
+        dx_vp = self._vertices[:, 0] - asarray(x, dtype=float64)[..., None]
+        dy_vp = self._vertices[:, 1] - asarray(y, dtype=float64)[..., None]
+        norm_vp = sqrt(dx_vp**2 + dy_vp**2)
+        dx_0p, dy_0p, norm_0p = dx_vp[..., :-1], dy_vp[..., :-1], norm_vp[..., :-1]
+        dx_1p, dy_1p, norm_1p = dx_vp[..., 1:], dy_vp[..., 1:], norm_vp[..., 1:]
+        dx_10, dy_10 = self._directions[:, 0], self._directions[:, 1]
+        norm_10 = self._lengths
+
+        lam = self.lam
+        cos_theta_p01 = -(dx_0p*dx_10 + dy_0p*dy_10)/(norm_0p*norm_10)
+        cos_theta_p10 = -(dx_1p*dx_10 + dy_1p*dy_10)/(norm_1p*norm_10)
+        cross_p01 = dx_0p*dy_1p - dx_1p*dy_0p
+        # -sign*lam*(cos(theta_p10) - cos(theta_p01))/point_line_distance of LineCharge.
+        Eperp = where(cross_p01 != 0, lam*(cos_theta_p01 - cos_theta_p10)*norm_10 /
+                      where(cross_p01 != 0, cross_p01, 1), 0)
+        Epara = lam*(1/norm_1p - 1/norm_0p)
+
+        ux_10, uy_10 = dx_10/norm_10, dy_10/norm_10
+        field_x = array_sum(Epara*ux_10 - Eperp*uy_10, axis=-1)
+        field_y = array_sum(Eperp*ux_10 + Epara*uy_10, axis=-1)
+        return field_x, field_y
+
+    def to_line_charges(self):
+        """Equivalent LineCharge objects, one per segment."""
+        return [LineCharge(self.lam * length, vertex_1, vertex_2)
+                for (vertex_1, vertex_2), length in zip(self.segments, self._lengths)]
+
+    def is_close(self, x):
+        """True if position x is within R of the polyline."""
+        x = asarray(x, dtype=float64)
+        t = ((x - self._vertices[:-1]) * self._directions).sum(axis=1) / self._lengths**2
+        t = t.clip(0, 1)[:, None]
+        closest = self._vertices[:-1] + t * self._directions
+        return bool((sqrt(array_sum((x - closest)**2, axis=1)) < self.R).any())
+
+    def plot(self):
+        """Plot the charge."""
+        color = 'b' if self.q < 0 else 'r' if self.q > 0 else 'k'
+        width = 5*(sqrt(abs(self.lam)))
+        pyplot.plot(self._vertices[:, 0], self._vertices[:, 1], color, linewidth=width)
+
+
+class Polygon(Polyline):
+    """
+    Charge uniformly distributed over the border of a closed polygon.
+    Args:
+        q(float): total charge.
+        vertices(list): (V, 2) vertices of the polygon, V >= 3. A last vertex repeating the first
+            one is dropped, the polygon is always closed.
+    """
+
+    def __init__(self, q, vertices):
+        vertices = _distinct_vertices(vertices)
+        if len(vertices) > 1 and (vertices[-1] == vertices[0]).all():
+            vertices = vertices[:-1]
+        if len(vertices) < 3:
+            raise ValueError('A polygon needs at least 3 distinct vertices.')
+        super().__init__(q, concatenate([vertices, vertices[:1]]))
+
+
+class Arc(Polyline):
+    """
+    Charge uniformly distributed over a circular arc, approximated by chords.
+    Args:
+        q(float): total charge.
+        center(list): (2,) center of the circle.
+        radius(float): radius of the circle.
+        start_angle(float): angle of the first vertex, in radians.
+        end_angle(float): angle of the last vertex, in radians.
+        number_of_segments(int): number of chords.
+    """
+
+    def __init__(self, q, center, radius, start_angle=0, end_angle=2*pi, number_of_segments=32):
+        angles = start_angle + (end_angle - start_angle) * arange(
+            number_of_segments + 1) / number_of_segments
+        vertices = stack([center[0] + radius*cos(angles), center[1] + radius*sin(angles)], axis=1)
+        super().__init__(q, vertices)
+
+
+def _distinct_vertices(vertices):
+    vertices = array(vertices, dtype=float64).reshape(-1, 2)
+    # Zero-length segments have no direction, their field would be NaN.
+    distinct = concatenate([[True], (vertices[1:] != vertices[:-1]).any(axis=1)])
+    return vertices[distinct]
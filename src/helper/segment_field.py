@@ -0,0 +1,42 @@
+"""
+Electric Field of a uniformly charged line segment.
+
+The formula is plain python so the same code is compiled as a CUDA device function by the
+parallel kernels and with njit by the mutual interaction forces.
+"""
+from math import copysign, fabs, sqrt
+
+
+def segment_field(dx_0p, dy_0p, norm_0p, dx_1p, dy_1p, norm_1p, lam):
+    """
+    Calculate the parallel and perpendicular components of the field of a segment at a point p.
+    The cosines of angle(p, v0, v1) and angle(p, v1, v0) are t_0/norm_0p and t_1/norm_1p, where
+    t_0 and t_1 are the coordinates of p along the segment, and the perpendicular component is
+    divided by the signed distance from p to the segment line.
+    Arguments:
+        dx_0p(float): x-axis difference between the first vertex and the point.
+        dy_0p(float): y-axis difference between the first vertex and the point.
+        norm_0p(float): distance between the first vertex and the point.
+        dx_1p(float): x-axis difference between the second vertex and the point.
+        dy_1p(float): y-axis difference between the second vertex and the point.
+        norm_1p(float): distance between the second vertex and the point.
+        lam(float): linear charge density.
+    Returns:
+        tuple: parallel and perpendicular components and the unit vector from v0 to v1.
+    """
+    # pylint: disable=invalid-name
+    dx_10, dy_10 = dx_1p - dx_0p, dy_1p - dy_0p
+    norm_10 = sqrt(dx_10**2 + dy_10**2)
+    ux_10, uy_10 = dx_10/norm_10, dy_10/norm_10
+    t_0 = -(dx_0p*ux_10 + dy_0p*uy_10)
+    t_1 = -(dx_1p*ux_10 + dy_1p*uy_10)
+    distance = (dx_0p*dy_1p - dx_1p*dy_0p)/norm_10
+    Epara = lam*(1/norm_1p - 1/norm_0p)
+    if t_0*t_1 > 0:
+        # Beyond the segment ends both cosines are close to +-1, t/r = +-(1 - d²/(r(r+|t|)))
+        # avoids their cancellation in float32.
+        Eperp = lam*copysign(1, t_0)*distance*(1/(norm_1p*(norm_1p + fabs(t_1))) -
+                                               1/(norm_0p*(norm_0p + fabs(t_0))))
+    else:
+        Eperp = lam*(t_0/norm_0p - t_1/norm_1p)/distance if distance != 0 else 0
+    return Epara, Eperp, ux_10, uy_10
@@ -0,0 +1,159 @@
+"""
+Symmetry detection over the packed charges array.
+
+The Electric Field magnitude of a scene is kept by a mirror or 180 degrees rotation when every
+charge is mapped to a charge of the same type and geometry with the same charge, or every charge
+is mapped to one with the opposite charge (dipole like scenes). When the ConfigOption grid is
+centred on the symmetry, only its fundamental region needs to be calculated.
+"""
+from numpy import abs as absolute, argmax, array, concatenate, empty, float64, ones
+
+from src.helper.charges_array import charges_to_array
+
+MIRROR_X = 'mirror_x'
+MIRROR_Y = 'mirror_y'
+ROTATION_180 = 'rotation_180'
+
+
+def detect_symmetries(charges_array, tolerance=1e-6):
+    """
+    Detect the symmetries of a scene about its centroid.
+    Arguments:
+        charges_array(numpy.array): (N, 7) packed charges.
+        tolerance(float): maximum position and charge difference of matching charges.
+    Returns:
+        tuple: (x, y) centroid of the charges positions.
+        set: detected symmetries, MIRROR_X (x -> -x), MIRROR_Y (y -> -y) and ROTATION_180.
+    """
+    if len(charges_array) == 0:
+        return (0, 0), set()
+    charges_array = array(charges_array, dtype=float64)
+    lines = charges_array[:, 0] == 2
+    vertices = concatenate([charges_array[:, 2:4], charges_array[lines, 4:6]])
+    center = vertices.mean(axis=0)
+
+    transformations = {
+        MIRROR_X: (-1, 1),
+        MIRROR_Y: (1, -1),
+        ROTATION_180: (-1, -1),
+    }
+    symmetries = set()
+    for symmetry, scale in transformations.items():
+        transformed = _transform(charges_array, center, scale)
+        if any(_matches(charges_array, transformed, sign, tolerance) for sign in (1, -1)):
+            symmetries.add(symmetry)
+    return tuple(center), symmetries
+
+
+def grid_symmetry(config_option, charges, tolerance=1e-6):
+    """
+    Find the symmetry of a scene that is aligned with the ConfigOption grid.
+    Arguments:
+        config_option(object): ConfigOption object with the configuration values.
+        charges(list): electric charges that generate the Electric Field.
+        tolerance(float): maximum position and charge difference of matching charges.
+    Returns:
+        object: GridSymmetry, or None if the grid is not aligned with any symmetry.
+    """
+    center, symmetries = detect_symmetries(charges_to_array(charges, float64), tolerance)
+    grid_center_x = (config_option.fixed_x_min + config_option.fixed_x_max) / 2
+    grid_center_y = (config_option.fixed_y_min + config_option.fixed_y_max) / 2
+    x_aligned = abs(center[0] - grid_center_x) <= tolerance
+    y_aligned = abs(center[1] - grid_center_y) <= tolerance
+    aligned = set()
+    if MIRROR_X in symmetries and x_aligned:
+        aligned.add(MIRROR_X)
+    if MIRROR_Y in symmetries and y_aligned:
+        aligned.add(MIRROR_Y)
+    if ROTATION_180 in symmetries and x_aligned and y_aligned:
+        aligned.add(ROTATION_180)
+    if not aligned:
+        return None
+    shape = (len(config_option.y_axis), len(config_option.x_axis))
+    return GridSymmetry(aligned, shape)
+
+
+class GridSymmetry():
+    """
+    Symmetry of a grid centred on the symmetry of its scene.
+    Args:
+        symmetries(set): aligned symmetries, MIRROR_X, MIRROR_Y and ROTATION_180.
+        shape(tuple): (rows, columns) of the full grid.
+    """
+
+    @property
+    def symmetries(self):
+        """Aligned symmetries."""
+        return self.__symmetries
+
+    @property
+    def region_shape(self):
+        """(rows, columns) of the fundamental region, the top left corner of the grid."""
+        rows, columns = self.__shape
+        half_rows, half_columns = (rows + 1) // 2, (columns + 1) // 2
+        if MIRROR_X in self.__symmetries and MIRROR_Y in self.__symmetries:
+            return half_rows, half_columns
+        if MIRROR_X in self.__symmetries:
+            return rows, half_columns
+        return half_rows, columns
+
+    def __init__(self, symmetries, shape):
+        self.__symmetries = set(symmetries)
+        self.__shape = tuple(shape)
+
+    def expand(self, region):
+        """
+        Fill the full grid by mirroring the fundamental region.
+        Arguments:
+            region(numpy.array): matrix with the fundamental region values.
+        Returns:
+            numpy.array: matrix with the full grid values.
+        """
+        rows, columns = self.__shape
+        region_rows, region_columns = region.shape[:2]
+        result = empty(self.__shape + region.shape[2:], dtype=region.dtype)
+        result[:region_rows, :region_columns] = region
+        if MIRROR_X in self.__symmetries:
+            mirrored_columns = columns - region_columns
+            result[:region_rows, region_columns:] = region[:, :mirrored_columns][:, ::-1]
+        if MIRROR_Y in self.__symmetries:
+            mirrored_rows = rows - region_rows
+            result[region_rows:] = result[:mirrored_rows][::-1]
+        elif region_rows < rows:
+            mirrored_rows = rows - region_rows
+            result[region_rows:] = result[:mirrored_rows][::-1, ::-1]
+        return result
+
+
+def _transform(charges_array, center, scale):
+    transformed = charges_array.copy()
+    for first_column in (2, 4):
+        for axis in (0, 1):
+            column = first_column + axis
+            transformed[:, column] = center[axis] + scale[axis] * (
+                charges_array[:, column] - center[axis])
+    # Point charges keep the unused columns as zero.
+    transformed[charges_array[:, 0] != 2, 4:6] = 0
+    return transformed
+
+
+def _matches(charges_array, transformed, sign, tolerance):
+    available = ones(len(charges_array), dtype=bool)
+    for transformed_charge in transformed:
+        candidates = available & _same_charges(charges_array, transformed_charge, sign, tolerance)
+        if not candidates.any():
+            return False
+        available[argmax(candidates)] = False
+    return True
+
+
+def _same_charges(charges_array, transformed_charge, sign, tolerance):
+    same_type = charges_array[:, 0] == transformed_charge[0]
+    same_charge = absolute(charges_array[:, 1] - sign * transformed_charge[1]) <= tolerance
+    same_vertices = (absolute(charges_array[:, 2:6] - transformed_charge[2:6]) <= tolerance).all(
+        axis=1)
+    # A line charge is the same with its vertices swapped.
+    swapped_vertices = transformed_charge[[4, 5, 2, 3]]
+    same_swapped_vertices = (charges_array[:, 0] == 2) & (
+        absolute(charges_array[:, 2:6] - swapped_vertices) <= tolerance).all(axis=1)
+    return same_type & same_charge & (same_vertices | same_swapped_vertices)
@@ -0,0 +1,275 @@
+"""
+Mutual interaction between the charges of a scene.
+
+The point charges of the scene are mobile and feel the Electric Field of every other charge,
+line and segment charges are kept fixed. Forces are computed over the packed charges array (the
+charges_to_array representation, one row per point charge or segment) by an exact all-pairs
+kernel or by a cell list approximation that ignores point charges farther than a cutoff distance.
+"""
+from math import floor, inf, sqrt
+from time import time
+
+from numba import njit, prange
+from numpy import (arange, asarray, broadcast_to, empty, float64, hypot, int64, isin, repeat,
+                   zeros)
+
+from src.helper.charges_array import charge_rows, charges_to_array
+from src.helper.segment_field import segment_field
+
+METHODS = ('all_pairs', 'cell_list')
+
+_segment_field = njit(segment_field)
+
+
+class MutualInteraction():
+    """
+    Move the point charges of a scene under the forces of the other charges.
+    Args:
+        charges(list): electric charges of the scene, point charges are updated in place.
+        masses(float): mass of the charges, scalar or array with one value per charge.
+        method(str): 'all_pairs' (exact) or 'cell_list' (cutoff approximation).
+        cutoff(float): maximum distance between interacting point charges of 'cell_list'.
+        softening(float): length added to the distance between point charges to avoid the
+            singularity of overlapping charges.
+        fixed(list): indexes of point charges that must not be moved.
+        damping(float): velocity damping rate used by step().
+        electric_field(object): SequentialElectricField (or subclass) of the same charges, its
+            packed charges are updated after each step so the field map can be calculated again.
+            Backends built on the scene without passing them here keep the previous positions
+            until their update_charges() is called.
+    """
+
+    @property
+    def charges(self):
+        """Electric charges of the scene."""
+        return self._charges
+
+    @property
+    def positions(self):
+        """(N, 2) positions of the packed rows, the first vertex for line segments."""
+        return self._charges_array[:, 2:4]
+
+    @property
+    def velocities(self):
+        """(N, 2) velocities of the packed rows."""
+        return self._velocities
+
+    def __init__(self, charges, masses=1, method='all_pairs', cutoff=None, softening=0.01,
+                 fixed=None, damping=0, electric_field=None):
+        if method not in METHODS:
+            raise ValueError(f'Unknown method {method}, use one of {METHODS}.')
+        if method == 'cell_list' and not cutoff:
+            raise ValueError('The cell_list method needs a positive cutoff.')
+        self._charges = charges
+        self._method = method
+        self._cutoff = cutoff
+        self._softening = softening
+        self._damping = damping
+        self._electric_field = electric_field
+        self._charges_array = charges_to_array(charges, float64)
+        rows = [charge_rows(charge) for charge in charges]
+        self._rows_charge = repeat(arange(len(charges)), rows)
+        masses = broadcast_to(asarray(masses, dtype=float64), (len(charges),))
+        self._masses = masses[self._rows_charge]
+        self._mobile = self._charges_array[:, 0] != 2
+        if fixed is not None:
+            self._mobile &= ~isin(self._rows_charge, list(fixed))
+        self._velocities = zeros((len(self._charges_array), 2), dtype=float64)
+        self._forces = None
+
+    def forces(self):
+        """
+        Calculate the force over each charge.
+        Returns:
+            numpy.array: (N, 2) forces of the packed rows, zero for the rows that are not mobile.
+        """
+        forces = empty((len(self._charges_array), 2), dtype=float64)
+        if self._method == 'all_pairs':
+            _all_pairs_forces(self._charges_array, self._mobile, self._softening, forces)
+        else:
+            _cell_list_forces(
+                self._charges_array, self._mobile, self._softening, self._cutoff, forces)
+        return forces
+
+    def step(self, dt):
+        """
+        Advance the mobile charges by one velocity-Verlet time step.
+        Arguments:
+            dt(float): time step.
+        """
+        if self._forces is None:
+            self._forces = self.forces()
+        accelerations = self._forces / self._masses[:, None]
+        self.positions[:] += self._velocities * dt + 0.5 * accelerations * dt**2
+        self._forces = self.forces()
+        new_accelerations = self._forces / self._masses[:, None]
+        self._velocities += 0.5 * (accelerations + new_accelerations) * dt
+        self._velocities *= max(0, 1 - self._damping * dt)
+        self._update_scene()
+
+    def run(self, steps, dt):
+        """
+        Advance the mobile charges by multiple time steps.
+        Arguments:
+            steps(int): number of time steps.
+            dt(float): time step.
+        Returns:
+            dict: execution report with the charge-steps per second.
+        """
+        start_time = time()
+        for _ in range(steps):
+            self.step(dt)
+        total_time = time() - start_time
+        return self._report(steps, total_time)
+
+    def relax(self, max_steps=1000, tolerance=1e-3, max_displacement=0.01):
+        """
+        Minimize the energy of the scene moving the charges along their forces.
+        Arguments:
+            max_steps(int): maximum number of steepest descent steps.
+            tolerance(float): largest force magnitude of a relaxed scene.
+            max_displacement(float): initial displacement of the charge with the largest force
+                per step, halved each time the forces turn back.
+        Returns:
+            dict: execution report with the largest remaining force.
+        """
+        start_time = time()
+        steps, max_force, previous_forces = 0, 0, None
+        for steps in range(max_steps + 1):
+            forces = self.forces()
+            max_force = hypot(forces[:, 0], forces[:, 1]).max() if len(forces) else 0
+            if max_force < tolerance or steps == max_steps:
+                break
+            if previous_forces is not None and (forces * previous_forces).sum() < 0:
+                max_displacement /= 2
+            self.positions[:] += forces * (max_displacement / max_force)
+            self._update_scene()
+            previous_forces = forces
+        self._velocities[:] = 0
+        self._forces = None
+        total_time = time() - start_time
+        report = self._report(steps, total_time)
+        report.update({'max_force': float(max_force), 'converged': bool(max_force < tolerance)})
+        return report
+
+    def _report(self, steps, total_time):
+        charge_steps = steps * int(self._mobile.sum())
+        return {
+            'total_time': total_time,
+            'steps': steps,
+            'charge_steps': charge_steps,
+            'charge_steps_per_second': charge_steps / total_time if total_time else 0,
+        }
+
+    def _update_scene(self):
+        for row in self._mobile.nonzero()[0]:
+            self._charges[self._rows_charge[row]].x = self._charges_array[row, 2:4].copy()
+        update_charges = getattr(self._electric_field, 'update_charges', None)
+        if update_charges is not None:
+            update_charges()
+
+
+@njit('UniTuple(float64, 2)(float64, float64, float64[:], float64)')
+def _charge_field(xp, yp, charge, softening):
+    charge_type, q, x0, y0 = charge[0], charge[1], charge[2], charge[3]
+
+    # PointChargeFlatland or PointCharge
+    if charge_type == 0 or charge_type == 1:
+        dx, dy = xp - x0, yp - y0
+        r2 = dx**2 + dy**2 + softening**2
+        b = r2 if charge_type == 0 else r2**1.5
+        return q * dx / b, q * dy / b
+
+    # LineCharge
+    x1, y1, lam = charge[4], charge[5], charge[6]
+    dx_0p, dy_0p = x0 - xp, y0 - yp
+    dx_1p, dy_1p = x1 - xp, y1 - yp
+    norm_0p = sqrt(dx_0p**2 + dy_0p**2)
+    norm_1p = sqrt(dx_1p**2 + dy_1p**2)
+    e_para, e_perp, ux_10, uy_10 = _segment_field(dx_0p, dy_0p, norm_0p, dx_1p, dy_1p, norm_1p,
+                                                  lam)
+    return e_para*ux_10 - e_perp*uy_10, e_perp*ux_10 + e_para*uy_10
+
+
+@njit('void(float64[:,:], boolean[:], float64, float64[:,:])', parallel=True)
+def _all_pairs_forces(charges, mobile, softening, forces):
+    for i in prange(charges.shape[0]):
+        forces[i, 0], forces[i, 1] = 0, 0
+        if not mobile[i]:
+            continue
+        xp, yp = charges[i, 2], charges[i, 3]
+        field_x, field_y = 0.0, 0.0
+        for j in range(charges.shape[0]):
+            if j != i:
+                charge_field_x, charge_field_y = _charge_field(xp, yp, charges[j], softening)
+                field_x += charge_field_x
+                field_y += charge_field_y
+        forces[i, 0] = charges[i, 1] * field_x
+        forces[i, 1] = charges[i, 1] * field_y
+
+
+@njit('void(float64[:,:], boolean[:], float64, float64, float64[:,:])', parallel=True)
+def _cell_list_forces(charges, mobile, softening, cutoff, forces):
+    number_of_charges = charges.shape[0]
+
+    # Bounding box of the point charges. Line charges are not binned, they always act.
+    x_min, y_min, x_max, y_max = inf, inf, -inf, -inf
+    number_of_points = 0
+    for i in range(number_of_charges):
+        if charges[i, 0] != 2:
+            x_min, x_max = min(x_min, charges[i, 2]), max(x_max, charges[i, 2])
+            y_min, y_max = min(y_min, charges[i, 3]), max(y_max, charges[i, 3])
+            number_of_points += 1
+    if number_of_points == 0:
+        x_min, y_min, x_max, y_max = 0.0, 0.0, 0.0, 0.0
+
+    # Cells are never smaller than the cutoff, so only the 3x3 neighbour cells are visited, and
+    # they are grown for sparse scenes to keep the number of cells close to the number of points.
+    cell_size = max(cutoff, max(x_max - x_min, y_max - y_min) / sqrt(max(number_of_points, 1)))
+    number_of_columns = int(floor((x_max - x_min) / cell_size)) + 1
+    number_of_rows = int(floor((y_max - y_min) / cell_size)) + 1
+
+    cell = zeros(number_of_charges, dtype=int64)
+    cell_start = zeros(number_of_columns * number_of_rows + 1, dtype=int64)
+    for i in range(number_of_charges):
+        if charges[i, 0] != 2:
+            column = int(floor((charges[i, 2] - x_min) / cell_size))
+            row = int(floor((charges[i, 3] - y_min) / cell_size))
+            cell[i] = row * number_of_columns + column
+            cell_start[cell[i] + 1] += 1
+    for c in range(number_of_columns * number_of_rows):
+        cell_start[c + 1] += cell_start[c]
+    cell_charges = zeros(number_of_points, dtype=int64)
+    cell_cursor = cell_start.copy()
+    for i in range(number_of_charges):
+        if charges[i, 0] != 2:
+            cell_charges[cell_cursor[cell[i]]] = i
+            cell_cursor[cell[i]] += 1
+
+    line_rows = (charges[:, 0] == 2).nonzero()[0]
+    cutoff_2 = cutoff**2
+    for i in prange(number_of_charges):
+        forces[i, 0], forces[i, 1] = 0, 0
+        if not mobile[i]:
+            continue
+        xp, yp = charges[i, 2], charges[i, 3]
+        field_x, field_y = 0.0, 0.0
+        for j in line_rows:
+            charge_field_x, charge_field_y = _charge_field(xp, yp, charges[j], softening)
+            field_x += charge_field_x
+            field_y += charge_field_y
+        column, row = cell[i] % number_of_columns, cell[i] // number_of_columns
+        for neighbour_row in range(max(row - 1, 0), min(row + 2, number_of_rows)):
+            for neighbour_column in range(max(column - 1, 0),
+                                          min(column + 2, number_of_columns)):
+                neighbour_cell = neighbour_row * number_of_columns + neighbour_column
+                for index in range(cell_start[neighbour_cell], cell_start[neighbour_cell + 1]):
+                    j = cell_charges[index]
+                    dx, dy = xp - charges[j, 2], yp - charges[j, 3]
+                    if j != i and dx**2 + dy**2 < cutoff_2:
+                        charge_field_x, charge_field_y = _charge_field(
+                            xp, yp, charges[j], softening)
+                        field_x += charge_field_x
+                        field_y += charge_field_y
+        forces[i, 0] = charges[i, 1] * field_x
+        forces[i, 1] = charges[i, 1] * field_y
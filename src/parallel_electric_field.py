@@ -1,15 +1,19 @@
 """
 Parallel implementation of SequentialElectricField.
 """
-from math import acos, cos, fabs, log10, pi, sqrt
+from math import log10, sqrt
 from time import time
 
-from electrostatics import LineCharge, PointCharge, PointChargeFlatland
 from numba import cuda
-from numpy import float32, zeros
+from numpy import float32
 
 from src.sequential_electric_field import SequentialElectricField
+from src.helper.charges_array import charges_to_array, polylines_to_arrays
 from src.helper.cuda_helper import cuda_args
+from src.helper.segment_charges import Polyline
+from src.helper.segment_field import segment_field
+
+_segment_field = cuda.jit(device=True)(segment_field)
 
 
 class ParallelElectricField(SequentialElectricField):
@@ -18,12 +22,18 @@ class ParallelElectricField(SequentialElectricField):
     Args:
         config_option(object): ConfigOption object with the configuration values.
         charges(list): electric charges that generate the Electric Field.
+        number_of_cores(int): maximum number of threads per block.
+        autotuner(object): CudaAutotuner used to choose the block dimensions. If None, the blocks
+            are defined by cuda_args.
+        use_symmetry(bool): calculate only the fundamental region of symmetric scenes.
     """
 
-    def __init__(self, config_option, charges, number_of_cores=1024):
-        super().__init__(config_option, charges)
-        self._charges_array = self._charges_to_array(charges)
+    def __init__(self, config_option, charges, number_of_cores=1024, autotuner=None,
+                 use_symmetry=True):
+        super().__init__(config_option, charges, use_symmetry)
         self.number_of_cores = number_of_cores
+        self.autotuner = autotuner
+        self.update_charges()
 
     def time_it(self, **kwargs):
         """
@@ -67,18 +77,38 @@ class ParallelElectricField(SequentialElectricField):
         }
 
     def _calculate_charges_electric_field_vectors(self, partial, x, y, charges):
+        # Partial columns hold the packed charges followed by the polylines.
+        number_of_charges = len(self._charges_array)
+        number_of_polylines = len(self._polylines_array)
         start_time = time()
-        grid, block = cuda_args(partial, 3, self.number_of_cores)
         device_partial = cuda.to_device(partial)
         device_x = cuda.to_device(x)
         device_y = cuda.to_device(y)
         device_charges = cuda.to_device(self._charges_array)
+        device_vertices = cuda.to_device(self._vertices_array)
+        device_polylines = cuda.to_device(self._polylines_array)
+        if number_of_charges:
+            charges_grid, charges_block = self._cuda_args(
+                _calculate_charges_electric_field_vectors, partial[:, :, :number_of_charges], 3,
+                device_partial, device_x, device_y, device_charges)
+        if number_of_polylines:
+            polylines_grid, polylines_block = self._cuda_args(
+                _calculate_polylines_electric_field_vectors, partial[:, :, number_of_charges:], 3,
+                device_partial, device_x, device_y, device_vertices, device_polylines,
+                number_of_charges)
         sequential_time = time() - start_time
 
         start_time = time()
         # pylint: disable=E1136  # pylint/issues/3139
-        _calculate_charges_electric_field_vectors[grid, block](
-            device_partial, device_x, device_y, device_charges)
+        if number_of_charges:
+            _calculate_charges_electric_field_vectors[charges_grid, charges_block](
+                device_partial, device_x, device_y, device_charges)
+        if number_of_polylines:
+            _calculate_polylines_electric_field_vectors[polylines_grid, polylines_block](
+                device_partial, device_x, device_y, device_vertices, device_polylines,
+                number_of_charges)
+        # Kernel launches are asynchronous.
+        cuda.synchronize()
         parallel_time = time() - start_time
 
         start_time = time()
@@ -88,14 +118,16 @@ class ParallelElectricField(SequentialElectricField):
 
     def _calculate_electric_field_magnitudes(self, partial, result):
         start_time = time()
-        grid, block = cuda_args(result, 2, self.number_of_cores)
         device_partial = cuda.to_device(partial)
         device_result = cuda.to_device(result)
+        grid, block = self._cuda_args(
+            _calculate_electric_field_magnitudes, result, 2, device_partial, device_result)
         sequential_time = time() - start_time
 
         start_time = time()
         # pylint: disable=E1136  # pylint/issues/3139
         _calculate_electric_field_magnitudes[grid, block](device_partial, device_result)
+        cuda.synchronize()
         parallel_time = time() - start_time
 
         start_time = time()
@@ -103,31 +135,28 @@ class ParallelElectricField(SequentialElectricField):
         sequential_time += time() - start_time
         return sequential_time, parallel_time
 
+    def _cuda_args(self, kernel, matrix, dimensions, *kernel_args):
+        if self.autotuner is None:
+            return cuda_args(matrix, dimensions, self.number_of_cores)
+        return self.autotuner.launch_args(
+            kernel, matrix, kernel_args, dimensions, self.number_of_cores)
+
+    def update_charges(self):
+        """Pack the charges again, needed after they have been moved."""
+        polylines = [charge for charge in self._charges if isinstance(charge, Polyline)]
+        self._charges_array = self._charges_to_array(
+            [charge for charge in self._charges if not isinstance(charge, Polyline)])
+        self._vertices_array, self._polylines_array = polylines_to_arrays(polylines)
+
     @staticmethod
-    def _charges_to_array(charges):
-        chagres_array = zeros((len(charges), 7), dtype=float32)
-        for i, charge in enumerate(charges):
-            if isinstance(charge, PointCharge) or isinstance(charge, PointChargeFlatland):
-                chagres_array[i][0] = 0 if isinstance(charge, PointChargeFlatland) else 1
-                chagres_array[i][1] = charge.q
-                chagres_array[i][2] = charge.x[0]
-                chagres_array[i][3] = charge.x[1]
-                chagres_array[i][4], chagres_array[i][5], chagres_array[i][6] = 0, 0, 0
-            if isinstance(charge, LineCharge):
-                chagres_array[i][0] = 2
-                chagres_array[i][1] = charge.q
-                chagres_array[i][2] = charge.x1[0]
-                chagres_array[i][3] = charge.x1[1]
-                chagres_array[i][4] = charge.x2[0]
-                chagres_array[i][5] = charge.x2[1]
-                chagres_array[i][6] = charge.lam
-        return chagres_array
+    def _charges_to_array(charges, dtype=float32):
+        return charges_to_array(charges, dtype)
 
 
 @cuda.jit('void(float32[:,:,:,:], float32[:,:], float32[:,:], float32[:,:])')
 def _calculate_charges_electric_field_vectors(partial, x, y, charges):
     i, j, k = cuda.grid(3)
-    if i >= partial.shape[0] or j >= partial.shape[1] or k >= partial.shape[2]:
+    if i >= partial.shape[0] or j >= partial.shape[1] or k >= charges.shape[0]:
         return
 
     xp, yp = x[i][j], y[i][j]
@@ -146,42 +175,49 @@ def _calculate_charges_electric_field_vectors(partial, x, y, charges):
         y1 = charges[k][5]
         lam = charges[k][6]
 
-        # angle(p, v0, v1)
+        # pylint: disable=invalid-name
         dx_0p, dy_0p = x0 - xp, y0 - yp
-        dx_01, dy_01 = x0 - x1, y0 - y1
-        norm_0p = sqrt(dx_0p**2 + dy_0p**2)
-        norm_01 = sqrt(dx_01**2 + dy_01**2)
-        dot = dx_0p*dx_01 + dy_0p*dy_01
-        theta_p01 = acos(dot/(norm_0p*norm_01))
-
-        # angle(p, v1, v0)
         dx_1p, dy_1p = x1 - xp, y1 - yp
-        dx_10, dy_10 = x1 - x0, y1 - y0
+        norm_0p = sqrt(dx_0p**2 + dy_0p**2)
         norm_1p = sqrt(dx_1p**2 + dy_1p**2)
-        norm_10 = sqrt(dx_10**2 + dy_10**2)
-        dot = dx_1p*dx_10 + dy_1p*dy_10
-        theta_p10 = pi - acos(dot/(norm_1p*norm_10))
-
-        # point_line_distance(p, v0, v1)
-        dx_p0, dy_p0 = xp - x0, yp - y0
-        dx_p1, dy_p1 = xp - x1, yp - y1
-        cross_p01 = dx_p0*dy_p1 - dy_p0*dx_p1
-        point_line_distance_p01 = fabs(cross_p01)/norm_10
-
-        # Calculate the parallel and perpendicular components
-        # pylint: disable=invalid-name, invalid-unary-operand-type
-        sign = 1 if dx_0p*dy_1p - dx_1p*dy_0p > 0 else -1
-        Epara = lam*(1/norm_1p - 1/norm_0p)
-        Eperp = -sign*lam*(cos(theta_p10) - cos(theta_p01))/point_line_distance_p01 \
-            if point_line_distance_p01 != 0 else 0
+        Epara, Eperp, ux_10, uy_10 = _segment_field(dx_0p, dy_0p, norm_0p, dx_1p, dy_1p,
+                                                    norm_1p, lam)
 
         # Transform into the coordinate space and return
-        ux_10, uy_10 = dx_10/norm_10, dy_10/norm_10
         partial[i][j][k][0] = Epara*ux_10 - Eperp*uy_10
         partial[i][j][k][1] = Eperp*ux_10 + Epara*uy_10
 
 
 
+@cuda.jit('void(float32[:,:,:,:], float32[:,:], float32[:,:], float32[:,:], float32[:,:], '
+          'int64)')
+def _calculate_polylines_electric_field_vectors(partial, x, y, vertices, polylines, first_column):
+    i, j, k = cuda.grid(3)
+    if i >= partial.shape[0] or j >= partial.shape[1] or k >= polylines.shape[0]:
+        return
+
+    xp, yp = x[i][j], y[i][j]
+    first_vertex, number_of_vertices = int(polylines[k][0]), int(polylines[k][1])
+    lam = polylines[k][2]
+
+    # Vertex values are calculated once and reused by the next segment.
+    dx_0p, dy_0p = vertices[first_vertex][0] - xp, vertices[first_vertex][1] - yp
+    norm_0p = sqrt(dx_0p**2 + dy_0p**2)
+    field_vector_0, field_vector_1 = 0, 0
+    for vertex in range(first_vertex + 1, first_vertex + number_of_vertices):
+        dx_1p, dy_1p = vertices[vertex][0] - xp, vertices[vertex][1] - yp
+        norm_1p = sqrt(dx_1p**2 + dy_1p**2)
+        # pylint: disable=invalid-name
+        Epara, Eperp, ux_10, uy_10 = _segment_field(dx_0p, dy_0p, norm_0p, dx_1p, dy_1p,
+                                                    norm_1p, lam)
+        field_vector_0 += Epara*ux_10 - Eperp*uy_10
+        field_vector_1 += Eperp*ux_10 + Epara*uy_10
+        dx_0p, dy_0p, norm_0p = dx_1p, dy_1p, norm_1p
+
+    partial[i][j][first_column + k][0] = field_vector_0
+    partial[i][j][first_column + k][1] = field_vector_1
+
+
 @cuda.jit('void(float32[:,:,:,:], float32[:,:])')
 def _calculate_electric_field_magnitudes(partial, result):
     i, j = cuda.grid(2)
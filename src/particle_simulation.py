@@ -0,0 +1,245 @@
+"""
+Charged particle dynamics through the Electric Field of static charges.
+
+Test charges do not act on each other nor on the static charges, they are only pushed by the
+Electric Field evaluated with one of the electric field backends.
+"""
+from time import time
+
+from numpy import (asarray, broadcast_to, clip, concatenate, floor, float64, full, hypot, int8,
+                   isfinite, minimum, repeat, where, zeros)
+
+from src.helper.charges_array import charges_to_array
+from src.helper.cuda_autotuner import next_power_of_two
+
+ACTIVE = 0
+COLLIDED = 1
+ESCAPED = 2
+
+INTEGRATORS = ('verlet', 'rk4')
+
+
+class ParticleSimulation():
+    """
+    Advance an ensemble of test charges through the Electric Field.
+    Args:
+        electric_field(object): SequentialElectricField (or subclass) used to evaluate the field.
+        positions(numpy.array): (N, 2) initial positions of the test charges.
+        velocities(numpy.array): (N, 2) initial velocities of the test charges.
+        charge_to_mass(float): charge to mass ratio of the test charges, scalar or (N,) array.
+        integrator(str): 'verlet' (velocity-Verlet) or 'rk4' (fourth order Runge-Kutta).
+        interpolate(bool): evaluate the field by bilinear interpolation of a precomputed
+            calculate_vectors() grid instead of at the exact particle positions.
+        collision_radius(float): distance to a charge below which a test charge is absorbed.
+    """
+
+    @property
+    def positions(self):
+        """(N, 2) positions of the test charges."""
+        return self.__positions
+
+    @property
+    def velocities(self):
+        """(N, 2) velocities of the test charges."""
+        return self.__velocities
+
+    @property
+    def status(self):
+        """(N,) status of the test charges: ACTIVE, COLLIDED or ESCAPED."""
+        return self.__status
+
+    @property
+    def time(self):
+        """Simulated time."""
+        return self.__time
+
+    def __init__(self, electric_field, positions, velocities, charge_to_mass=1,
+                 integrator='verlet', interpolate=False, collision_radius=0.01):
+        if integrator not in INTEGRATORS:
+            raise ValueError(f'Unknown integrator {integrator}, use one of {INTEGRATORS}.')
+        self._electric_field = electric_field
+        self._integrator = integrator
+        self._interpolate = interpolate
+        self._collision_radius = collision_radius
+        self.__positions = asarray(positions, dtype=float64).copy()
+        self.__velocities = asarray(velocities, dtype=float64).copy()
+        number_of_particles = len(self.__positions)
+        self._charge_to_mass = broadcast_to(
+            asarray(charge_to_mass, dtype=float64), (number_of_particles,)).copy()
+        self.__status = zeros(number_of_particles, dtype=int8)
+        self.__time = 0
+        self._accelerations = None
+        self._charges_array = charges_to_array(electric_field.charges)
+        self._grid = self._create_grid() if interpolate else None
+        self._update_status(self.__positions, self.__positions, self.__velocities,
+                            full(number_of_particles, True))
+
+    def run(self, steps, dt):
+        """
+        Advance the active test charges.
+        Arguments:
+            steps(int): number of time steps.
+            dt(float): time step.
+        Returns:
+            dict: execution report with the particle-steps per second.
+        """
+        particle_steps = 0
+        start_time = time()
+        for _ in range(steps):
+            active = self.__status == ACTIVE
+            if not active.any():
+                break
+            particle_steps += int(active.sum())
+            self.step(dt)
+        total_time = time() - start_time
+        return {
+            'total_time': total_time,
+            'steps': steps,
+            'particle_steps': particle_steps,
+            'particle_steps_per_second': particle_steps / total_time if total_time else 0,
+            'active': int((self.__status == ACTIVE).sum()),
+            'collided': int((self.__status == COLLIDED).sum()),
+            'escaped': int((self.__status == ESCAPED).sum()),
+        }
+
+    def step(self, dt):
+        """
+        Advance the active test charges by one time step.
+        Arguments:
+            dt(float): time step.
+        """
+        active = self.__status == ACTIVE
+        old_positions = positions = self.__positions[active]
+        velocities = self.__velocities[active]
+        charge_to_mass = self._charge_to_mass[active]
+        if self._integrator == 'verlet':
+            positions, velocities = self._verlet_step(
+                positions, velocities, charge_to_mass, active, dt)
+        else:
+            positions, velocities = self._rk4_step(positions, velocities, charge_to_mass, dt)
+        self.__positions[active] = positions
+        self.__velocities[active] = velocities
+        self.__time += dt
+        self._update_status(old_positions, positions, velocities, active)
+
+    def field(self, positions):
+        """
+        Evaluate the Electric Field vectors at the given positions.
+        Arguments:
+            positions(numpy.array): (N, 2) positions.
+        Returns:
+            numpy.array: (N, 2) Electric Field vectors.
+        """
+        if self._interpolate:
+            return self._interpolate_field(positions)
+        number_of_positions = len(positions)
+        if getattr(self._electric_field, 'autotuner', None) is not None:
+            # Padding to a power of two bounds the number of launch shapes to be tuned while
+            # the number of active test charges decreases.
+            padding = next_power_of_two(number_of_positions) - number_of_positions
+            positions = concatenate([positions, repeat(positions[:1], padding, axis=0)])
+        x = positions[:, 0].reshape(-1, 1)
+        y = positions[:, 1].reshape(-1, 1)
+        vectors = self._electric_field.field_vectors(x, y).reshape(-1, 2)
+        return vectors[:number_of_positions].astype(float64)
+
+    def _verlet_step(self, positions, velocities, charge_to_mass, active, dt):
+        if self._accelerations is None:
+            self._accelerations = zeros(self.__positions.shape, dtype=float64)
+            self._accelerations[active] = self._acceleration(positions, charge_to_mass)
+        accelerations = self._accelerations[active]
+        positions = positions + velocities * dt + 0.5 * accelerations * dt**2
+        new_accelerations = self._acceleration(positions, charge_to_mass)
+        velocities = velocities + 0.5 * (accelerations + new_accelerations) * dt
+        self._accelerations[active] = new_accelerations
+        return positions, velocities
+
+    def _rk4_step(self, positions, velocities, charge_to_mass, dt):
+        k1_x, k1_v = velocities, self._acceleration(positions, charge_to_mass)
+        k2_x = velocities + 0.5 * dt * k1_v
+        k2_v = self._acceleration(positions + 0.5 * dt * k1_x, charge_to_mass)
+        k3_x = velocities + 0.5 * dt * k2_v
+        k3_v = self._acceleration(positions + 0.5 * dt * k2_x, charge_to_mass)
+        k4_x = velocities + dt * k3_v
+        k4_v = self._acceleration(positions + dt * k3_x, charge_to_mass)
+        positions = positions + dt / 6 * (k1_x + 2 * k2_x + 2 * k3_x + k4_x)
+        velocities = velocities + dt / 6 * (k1_v + 2 * k2_v + 2 * k3_v + k4_v)
+        return positions, velocities
+
+    def _acceleration(self, positions, charge_to_mass):
+        return charge_to_mass[:, None] * self.field(positions)
+
+    def _create_grid(self):
+        vectors, _, __ = self._electric_field.calculate_vectors()
+        # Points over the charges have no finite field, they are inside the collision radius.
+        vectors = where(isfinite(vectors), vectors, 0).astype(float64)
+        config_option = self._electric_field.config_option
+        return vectors, config_option.x_axis.astype(float64), config_option.y_axis.astype(float64)
+
+    def _interpolate_field(self, positions):
+        vectors, x_axis, y_axis = self._grid
+        column, column_weight = self._cell(positions[:, 0], x_axis)
+        row, row_weight = self._cell(positions[:, 1], y_axis)
+        column_weight, row_weight = column_weight[:, None], row_weight[:, None]
+        return ((1 - row_weight) * (1 - column_weight) * vectors[row, column] +
+                (1 - row_weight) * column_weight * vectors[row, column + 1] +
+                row_weight * (1 - column_weight) * vectors[row + 1, column] +
+                row_weight * column_weight * vectors[row + 1, column + 1])
+
+    @staticmethod
+    def _cell(values, axis):
+        spacing = (axis[-1] - axis[0]) / (len(axis) - 1)
+        fractional_index = clip((values - axis[0]) / spacing, 0, len(axis) - 1)
+        index = minimum(floor(fractional_index).astype(int), len(axis) - 2)
+        return index, fractional_index - index
+
+    def _update_status(self, old_positions, positions, velocities, active):
+        config_option = self._electric_field.config_option
+        x, y = positions[:, 0], positions[:, 1]
+        escaped = ((x < config_option.fixed_x_min) | (x > config_option.fixed_x_max) |
+                   (y < config_option.fixed_y_min) | (y > config_option.fixed_y_max))
+        # The whole path of the step is tested, a test charge may cross a charge within one dt.
+        collided = self._charges_distance(old_positions, positions) < self._collision_radius
+        # Non-finite values only come from the singular field over a charge.
+        collided |= ~(isfinite(positions).all(axis=1) & isfinite(velocities).all(axis=1))
+        status = where(collided, COLLIDED, where(escaped, ESCAPED, ACTIVE))
+        self.__status[active] = status
+
+    def _charges_distance(self, old_positions, positions):
+        distance = full(len(positions), float('inf'))
+        x0, y0 = old_positions[:, 0], old_positions[:, 1]
+        x1, y1 = positions[:, 0], positions[:, 1]
+        for charge_type, _, charge_x0, charge_y0, charge_x1, charge_y1, __ in self._charges_array:
+            if charge_type == 2:
+                charge_distance = _segments_distance(x0, y0, x1, y1, charge_x0, charge_y0,
+                                                     charge_x1, charge_y1)
+            else:
+                charge_distance = _point_segment_distance(charge_x0, charge_y0, x0, y0, x1, y1)
+            distance = minimum(distance, charge_distance)
+        return distance
+
+
+def _point_segment_distance(x, y, x0, y0, x1, y1):
+    dx, dy = x1 - x0, y1 - y0
+    length_squared = dx**2 + dy**2
+    # Zero length segments, test charges that did not move, are their first point.
+    t = clip(((x - x0) * dx + (y - y0) * dy) / where(length_squared > 0, length_squared, 1), 0, 1)
+    return hypot(x - (x0 + t * dx), y - (y0 + t * dy))
+
+
+def _segments_distance(x0, y0, x1, y1, u0, v0, u1, v1):
+    def cross(ax, ay, bx, by):
+        return ax * by - ay * bx
+
+    # Segments that cross each other, touching and collinear segments have an end point on the
+    # other segment and are found by the end point distances.
+    crossing = ((cross(u1 - u0, v1 - v0, x0 - u0, y0 - v0) *
+                 cross(u1 - u0, v1 - v0, x1 - u0, y1 - v0) < 0) &
+                (cross(x1 - x0, y1 - y0, u0 - x0, v0 - y0) *
+                 cross(x1 - x0, y1 - y0, u1 - x0, v1 - y0) < 0))
+    distance = minimum(
+        minimum(_point_segment_distance(x0, y0, u0, v0, u1, v1),
+                _point_segment_distance(x1, y1, u0, v0, u1, v1)),
+        minimum(_point_segment_distance(u0, v0, x0, y0, x1, y1),
+                _point_segment_distance(u1, v1, x0, y0, x1, y1)))
+    return where(crossing, 0, distance)
@@ -1,6 +1,8 @@
 """Report package."""
+from .backend_matrix import BackendMatrix
 from .time_evaluator import TimeEvaluator
 
 __all__ = [
+    'BackendMatrix',
     'TimeEvaluator',
 ]
@@ -0,0 +1,285 @@
+"""
+Cross-backend equivalence and throughput matrix.
+
+Random scenes of every charge type, charge count and grid size, plus edge case scenes, are
+calculated by every backend and compared with ElectricFieldWrapper, the reference based on the
+original electrostatics lib. Grid points on top of a charge are singular, their values depend on
+how each implementation handles the division by zero, so they are left out of the comparison.
+So are the grid points so close to a charge that rounding the coordinates to float32 alone
+changes the log10 magnitude by more than the tolerance.
+Each calculation also records its throughput in charge-point interactions per second, the
+number of grid points times the number of packed charge rows (one per line segment) over the
+calculation time, and its kernel throughput over the time of the field steps reported by
+time_it, without the work space creation and the device transfers. Throughput regressions are
+found on the kernel throughput.
+"""
+from math import cos, log, sin
+from time import time
+
+from electrostatics import LineCharge, PointCharge, PointChargeFlatland
+from numpy import (abs as array_abs, errstate, finfo, float32, hypot, isfinite, meshgrid, pi,
+                   sort, zeros)
+from numpy.random import default_rng
+
+from src.backends import BACKENDS
+from src.electric_field_wrapper import ElectricFieldWrapper
+from src.helper.charges_array import charges_to_array
+from src.helper.config_option import ConfigOption
+from src.helper.segment_charges import Arc, Polygon, Polyline
+
+CHARGE_TYPES = ('PointChargeFlatland', 'PointCharge', 'LineCharge', 'Polyline', 'Polygon', 'Arc')
+EDGE_CASES = ('on_charges', 'collinear')
+
+
+class BackendMatrix():
+    """
+    Check every backend against the reference over a matrix of random scenes.
+    Args:
+        backends(dict): backend classes by name, the registered backends by default.
+        charge_types(tuple): charge types of the random scenes, a 'mixed' scene with every type
+            is added for each charge count.
+        charge_counts(tuple): number of charges of the random scenes.
+        grid_sizes(tuple): number of elements of each axis of the grids, at least 9.
+        edge_cases(tuple): edge case scenes added for each grid size.
+        seed(int): seed of the random scenes.
+        tolerance(float): maximum absolute difference of the log10 magnitudes.
+        backend_kwargs(dict): extra constructor arguments by backend name.
+    """
+
+    def __init__(self, backends=None, charge_types=CHARGE_TYPES, charge_counts=(1, 4, 16),
+                 grid_sizes=(9, 32), edge_cases=EDGE_CASES, seed=0, tolerance=1e-4,
+                 backend_kwargs=None):
+        self._backends = BACKENDS if backends is None else backends
+        self._charge_types = charge_types
+        self._charge_counts = charge_counts
+        self._grid_sizes = grid_sizes
+        self._edge_cases = edge_cases
+        self._seed = seed
+        self._tolerance = tolerance
+        self._backend_kwargs = backend_kwargs or {}
+
+    def scenes(self):
+        """
+        Generate the scenes of the matrix, the same ones for the same seed.
+        Returns:
+            list: (name, config_option, charges) of each scene.
+        """
+        generator = default_rng(self._seed)
+        scenes = []
+        for grid_size in self._grid_sizes:
+            config_option = ConfigOption(
+                x_offset=generator.uniform(-1, 1), y_offset=generator.uniform(-1, 1),
+                elements_between_limits=grid_size)
+            for number_of_charges in self._charge_counts:
+                for charge_type in self._charge_types:
+                    charges = [random_charge(generator, charge_type, config_option)
+                               for _ in range(number_of_charges)]
+                    scenes.append((f'{charge_type}_{number_of_charges}_{grid_size}',
+                                   config_option, charges))
+                charge_types = self._charge_types
+                charges = [random_charge(generator, charge_types[i % len(charge_types)],
+                                         config_option) for i in range(number_of_charges)]
+                scenes.append((f'mixed_{number_of_charges}_{grid_size}', config_option, charges))
+            for edge_case in self._edge_cases:
+                scenes.append((f'{edge_case}_{grid_size}', config_option,
+                               edge_case_charges(edge_case, config_option)))
+        return scenes
+
+    def run(self):
+        """
+        Calculate every scene with every backend.
+        Returns:
+            dict: report with a record of each calculation and the summary of each backend.
+        """
+        scenes = self.scenes()
+        # To discard the compilation time.
+        for backend_name in self._backends:
+            self._calculate(backend_name, *scenes[0][1:])
+
+        records = []
+        for scene_name, config_option, charges in scenes:
+            x, y = meshgrid(config_option.x_axis, config_option.y_axis)
+            with errstate(all='ignore'):
+                reference = ElectricFieldWrapper(config_option, charges).magnitudes(x, y)
+            # The field near a charge is inversely proportional to the distance, so a float32
+            # rounding of the coordinates changes its log10 by about eps*scale/(distance*ln(10)).
+            scale = max(array_abs(x).max(), array_abs(y).max())
+            distance = max(1e-6, finfo(float32).eps * scale / (self._tolerance * log(10)))
+            compared = isfinite(reference) & ~singular_points(x, y, charges, distance)
+            interactions = x.size * len(charges_to_array(charges))
+            for backend_name in self._backends:
+                record = {'scene': scene_name, 'backend': backend_name,
+                          'grid_size': config_option.elements_between_limits,
+                          'charges': len(charges), 'interactions': interactions,
+                          'compared_points': int(compared.sum()),
+                          'singular_points': int(x.size - compared.sum())}
+                try:
+                    result, calculation_time, kernel_time = self._calculate(
+                        backend_name, config_option, charges)
+                except Exception as error:  # pylint: disable=broad-except
+                    record.update(passed=False, error=repr(error))
+                    records.append(record)
+                    continue
+                error = array_abs(result[compared] - reference[compared])
+                max_error = float(error.max()) if error.size else 0
+                record.update(
+                    calculation_time=calculation_time,
+                    interactions_per_second=(interactions / calculation_time
+                                             if calculation_time else 0),
+                    kernel_time=kernel_time,
+                    kernel_interactions_per_second=(interactions / kernel_time
+                                                    if kernel_time else 0),
+                    max_error=max_error,
+                    passed=bool(result.shape == reference.shape and isfinite(error).all()
+                                and max_error <= self._tolerance))
+                records.append(record)
+
+        return {
+            'passed': all(record['passed'] for record in records),
+            'backends': {backend_name: _summary([record for record in records
+                                                 if record['backend'] == backend_name])
+                         for backend_name in self._backends},
+            'records': records,
+        }
+
+    def _calculate(self, backend_name, config_option, charges):
+        electric_field = self._backends[backend_name](
+            config_option, charges, **self._backend_kwargs.get(backend_name, {}))
+        with errstate(all='ignore'):
+            start_time = time()
+            result, _, __ = electric_field.calculate()
+            calculation_time = time() - start_time
+            report = electric_field.time_it(sequential_time=0)
+        # The parallel steps are the kernels, the sequential steps after the work space creation
+        # are the field loops of the sequential backend.
+        kernel_time = sum(report['parallel_times'] if 'parallel_times' in report
+                          else report['sequential_times'][1:])
+        return result, calculation_time, kernel_time
+
+
+def random_charge(generator, charge_type, config_option):
+    """
+    Create a charge of the given type at a random position inside the grid.
+    Arguments:
+        generator(object): numpy random Generator.
+        charge_type(str): one of CHARGE_TYPES.
+        config_option(object): ConfigOption object of the grid.
+    Returns:
+        object: electrostatics charge or segment charge.
+    """
+    x_min, x_max = config_option.fixed_x_min, config_option.fixed_x_max
+    y_min, y_max = config_option.fixed_y_min, config_option.fixed_y_max
+    size = min(x_max - x_min, y_max - y_min)
+    q = generator.choice([-1, 1]) * generator.uniform(0.5, 2)
+    position = [generator.uniform(x_min, x_max), generator.uniform(y_min, y_max)]
+    if charge_type == 'PointChargeFlatland':
+        return PointChargeFlatland(q, position)
+    if charge_type == 'PointCharge':
+        return PointCharge(q, position)
+    if charge_type == 'LineCharge':
+        angle = generator.uniform(0, 2*pi)
+        length = generator.uniform(0.05, 0.3) * size
+        return LineCharge(q, position, [position[0] + length*cos(angle),
+                                        position[1] + length*sin(angle)])
+    if charge_type == 'Polyline':
+        steps = generator.normal(0, 0.1 * size, (generator.integers(2, 6), 2))
+        return Polyline(q, position + steps.cumsum(axis=0))
+    if charge_type == 'Polygon':
+        angles = sort(generator.uniform(0, 2*pi, generator.integers(3, 7)))
+        radius = generator.uniform(0.05, 0.2) * size
+        return Polygon(q, [[position[0] + radius*cos(angle), position[1] + radius*sin(angle)]
+                           for angle in angles])
+    if charge_type == 'Arc':
+        start_angle = generator.uniform(0, 2*pi)
+        return Arc(q, position, generator.uniform(0.05, 0.2) * size, start_angle,
+                   start_angle + generator.uniform(pi/4, 2*pi), int(generator.integers(4, 17)))
+    raise ValueError(f'Unknown charge type {charge_type}.')
+
+
+def edge_case_charges(edge_case, config_option):
+    """
+    Create the charges of an edge case scene.
+    'on_charges' puts point charges and the inside of line segments on grid points.
+    'collinear' puts grid points on the extension of line segments, along rows and columns.
+    Segment ends are placed between grid points, so no grid point is a segment end and segment
+    centers, where the field of a lonely segment vanishes, are not grid points either.
+    Arguments:
+        edge_case(str): one of EDGE_CASES.
+        config_option(object): ConfigOption object of the grid, at least 9 elements per axis.
+    Returns:
+        list: electrostatics charges and segment charges.
+    """
+    x_axis, y_axis = config_option.x_axis.astype(float), config_option.y_axis.astype(float)
+
+    def between(axis, index):
+        return (axis[index] + axis[index + 1]) / 2
+
+    if edge_case == 'on_charges':
+        return [PointChargeFlatland(2, [x_axis[1], y_axis[1]]),
+                PointCharge(-1.5, [x_axis[-2], y_axis[-3]]),
+                LineCharge(1, [between(x_axis, 2), y_axis[4]], [between(x_axis, 6), y_axis[4]]),
+                Polyline(-0.5, [[between(x_axis, 1), y_axis[6]], [between(x_axis, 3), y_axis[6]],
+                                [between(x_axis, 3), between(y_axis, 7)]])]
+    if edge_case == 'collinear':
+        return [LineCharge(1, [between(x_axis, 1), y_axis[3]], [between(x_axis, 3), y_axis[3]]),
+                LineCharge(-2, [between(x_axis, 5), y_axis[3]], [between(x_axis, 7), y_axis[3]]),
+                LineCharge(1.5, [x_axis[6], between(y_axis, 5)], [x_axis[6], between(y_axis, 7)])]
+    raise ValueError(f'Unknown edge case {edge_case}.')
+
+
+def singular_points(x, y, charges, distance=1e-6):
+    """
+    Find the grid points on top of a charge.
+    Arguments:
+        x(numpy.array): matrix with x-axis values.
+        y(numpy.array): matrix with y-axis values.
+        charges(list): electric charges.
+        distance(float): maximum distance from the charge.
+    Returns:
+        numpy.array: boolean matrix, True on singular points.
+    """
+    x, y = x.astype(float), y.astype(float)
+    singular = zeros(x.shape, dtype=bool)
+    for charge_type, _, x0, y0, x1, y1, __ in charges_to_array(charges, dtype=float):
+        if charge_type == 2:
+            dx, dy = x1 - x0, y1 - y0
+            t = (((x - x0)*dx + (y - y0)*dy) / (dx**2 + dy**2)).clip(0, 1)
+            x0, y0 = x0 + t*dx, y0 + t*dy
+        singular |= hypot(x - x0, y - y0) < distance
+    return singular
+
+
+def throughput_regressions(report, baseline_report, min_ratio=0.8):
+    """
+    Find the backends whose kernels became slower than in a baseline report.
+    Arguments:
+        report(dict): report of BackendMatrix.run.
+        baseline_report(dict): previous report of the same matrix.
+        min_ratio(float): minimum ratio between the current and the baseline kernel throughputs.
+    Returns:
+        dict: kernel throughput ratio of each backend below min_ratio.
+    """
+    regressions = {}
+    for backend_name, summary in report['backends'].items():
+        baseline = baseline_report['backends'].get(backend_name)
+        if not baseline or not baseline.get('kernel_interactions_per_second'):
+            continue
+        ratio = (summary['kernel_interactions_per_second']
+                 / baseline['kernel_interactions_per_second'])
+        if ratio < min_ratio:
+            regressions[backend_name] = ratio
+    return regressions
+
+
+def _summary(records):
+    timed = [record for record in records if 'calculation_time' in record]
+    calculation_time = sum(record['calculation_time'] for record in timed)
+    kernel_time = sum(record['kernel_time'] for record in timed)
+    interactions = sum(record['interactions'] for record in timed)
+    return {
+        'scenes': len(records),
+        'failures': sum(not record['passed'] for record in records),
+        'max_error': max((record['max_error'] for record in timed), default=0),
+        'interactions_per_second': interactions / calculation_time if calculation_time else 0,
+        'kernel_interactions_per_second': interactions / kernel_time if kernel_time else 0,
+    }
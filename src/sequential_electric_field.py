@@ -6,11 +6,13 @@ simulation values.
 """
 from time import time
 
-from numpy import float32, meshgrid, zeros
+from numpy import ascontiguousarray, float32, full, indices, meshgrid, nan, zeros
 from numpy import log10, sum
+from numpy.linalg import norm as vector_norm
 from electrostatics import norm
 
 from src.helper.drawer import Drawer
+from src.helper.symmetry import grid_symmetry
 
 
 class SequentialElectricField():
@@ -19,11 +21,24 @@ class SequentialElectricField():
     Args:
         config_option(object): ConfigOption object with the configuration values.
         charges(list): electric charges that generate the Electric Field.
+        use_symmetry(bool): calculate only the fundamental region of grids aligned with a mirror
+            or rotation symmetry of the charges, filling the rest by mirroring.
     """
 
-    def __init__(self, config_option, charges):
+    @property
+    def config_option(self):
+        """ConfigOption object with the configuration values."""
+        return self._config_option
+
+    @property
+    def charges(self):
+        """Electric charges that generate the Electric Field."""
+        return self._charges
+
+    def __init__(self, config_option, charges, use_symmetry=True):
         self._config_option = config_option
         self._charges = charges
+        self.use_symmetry = use_symmetry
         self._drawer = Drawer(self.calculate, config_option, charges)
 
     def draw(self, n_min, n_max, n_step, **kwargs):
@@ -44,11 +59,84 @@ class SequentialElectricField():
             x: matrix with x-axis values.
             y: matrix with y-axis values.
         """
-        partial, result, x, y = self._create_work_space()
+        symmetry = grid_symmetry(self._config_option, self._charges) if self.use_symmetry else None
+        partial, result, x, y = self._create_work_space(symmetry)
         self._calculate_charges_electric_field_vectors(partial, x, y, self._charges)
         self._calculate_electric_field_magnitudes(partial, result)
+        if symmetry is not None:
+            result = symmetry.expand(result)
+            x, y = meshgrid(self._config_option.x_axis, self._config_option.y_axis)
         return result, x, y
 
+    def calculate_progressive(self, strides=(8, 4, 2, 1), cancel_event=None):
+        """
+        Calculate the matrix with Electric Field values from coarse to full resolution.
+        Each level only calculates the points that are not in the coarser levels.
+        Arguments:
+            strides(tuple): decreasing sampling strides of the levels, 1 is full resolution.
+            cancel_event(object): threading.Event checked before each level, the calculation
+                stops as soon as it is set.
+        Yields:
+            numpy.array: matrix with calculated results of the level.
+            x: matrix with x-axis values of the level.
+            y: matrix with y-axis values of the level.
+        """
+        x, y = meshgrid(self._config_option.x_axis, self._config_option.y_axis)
+        result = full(x.shape, nan, dtype=float32)
+        rows, columns = indices(x.shape)
+        calculated = zeros(x.shape, dtype=bool)
+        for stride in strides:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            level = (rows % stride == 0) & (columns % stride == 0)
+            new_points = level & ~calculated
+            if new_points.any():
+                vectors = self.field_vectors(x[new_points][:, None], y[new_points][:, None])
+                result[new_points] = log10(vector_norm(vectors[:, 0], axis=1))
+                calculated |= new_points
+            yield result[::stride, ::stride], x[::stride, ::stride], y[::stride, ::stride]
+
+    def calculate_tile(self, rows, columns):
+        """
+        Calculate the Electric Field values of a rectangular tile of the grid.
+        Arguments:
+            rows(slice): rows of the tile, indices of the y-axis.
+            columns(slice): columns of the tile, indices of the x-axis.
+        Returns:
+            numpy.array: tile with calculated results.
+        """
+        partial, result, x, y = self._create_tile_work_space(
+            self._config_option.x_axis[columns], self._config_option.y_axis[rows])
+        self._calculate_charges_electric_field_vectors(partial, x, y, self._charges)
+        self._calculate_electric_field_magnitudes(partial, result)
+        return result
+
+    def calculate_vectors(self):
+        """
+        Calculate the matrix with Electric Field vectors.
+        Returns:
+            numpy.array: matrix with the (Ex, Ey) vector of each point.
+            x: matrix with x-axis values.
+            y: matrix with y-axis values.
+        """
+        x, y = meshgrid(self._config_option.x_axis, self._config_option.y_axis)
+        return self.field_vectors(x, y), x, y
+
+    def field_vectors(self, x, y):
+        """
+        Calculate the Electric Field vectors at arbitrary positions.
+        Arguments:
+            x(numpy.array): 2-D matrix with x-axis values.
+            y(numpy.array): 2-D matrix with y-axis values, same shape of x.
+        Returns:
+            numpy.array: matrix with the (Ex, Ey) vector of each position.
+        """
+        x = ascontiguousarray(x, dtype=float32)
+        y = ascontiguousarray(y, dtype=float32)
+        partial = zeros(x.shape + (len(self._charges), 2), dtype=float32)
+        self._calculate_charges_electric_field_vectors(partial, x, y, self._charges)
+        return sum(partial, axis=2)
+
     def time_it(self, **kwargs):
         """
         Calculate the matrix with Electric Field values.
@@ -80,9 +168,15 @@ class SequentialElectricField():
             ]
         }
 
-    def _create_work_space(self):
+    def _create_work_space(self, symmetry=None):
         x_axis = self._config_option.x_axis
         y_axis = self._config_option.y_axis
+        if symmetry is not None:
+            rows, columns = symmetry.region_shape
+            x_axis, y_axis = x_axis[:columns], y_axis[:rows]
+        return self._create_tile_work_space(x_axis, y_axis)
+
+    def _create_tile_work_space(self, x_axis, y_axis):
         x, y = meshgrid(x_axis, y_axis)
         result = zeros((len(y_axis), len(x_axis)), dtype=float32)
         partial = zeros((len(y_axis), len(x_axis), len(self._charges), 2), dtype=float32)
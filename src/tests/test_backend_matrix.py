@@ -0,0 +1,78 @@
+"""Unit test for BackendMatrix."""
+import unittest
+
+from numpy import meshgrid
+
+from src.backends import BACKENDS
+from src.sequential_electric_field import SequentialElectricField
+from src.helper.config_option import ConfigOption
+from src.report.backend_matrix import (CHARGE_TYPES, EDGE_CASES, BackendMatrix, edge_case_charges,
+                                       singular_points, throughput_regressions)
+
+
+class _ShiftedElectricField(SequentialElectricField):
+    """Backend with a wrong result."""
+
+    def calculate(self, **kwargs):
+        result, x, y = super().calculate(**kwargs)
+        return result + 0.01, x, y
+
+
+class TestBackendMatrix(unittest.TestCase):
+    """Unit test for BackendMatrix."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._backend_matrix = BackendMatrix(charge_counts=(1, 3), grid_sizes=(9, 12),
+                                            backend_kwargs={'parallel': {'number_of_cores': 16}})
+        cls._report = cls._backend_matrix.run()
+
+    def test_every_backend_should_be_equal_to_reference_results(self):
+        self.assertTrue(self._report['passed'], [record for record in self._report['records']
+                                                 if not record['passed']])
+        self.assertEqual(set(self._report['backends']), set(BACKENDS))
+        for summary in self._report['backends'].values():
+            self.assertEqual(summary['scenes'], 2 * (2 * (len(CHARGE_TYPES) + 1) + len(EDGE_CASES)))
+            self.assertGreater(summary['interactions_per_second'], 0)
+            self.assertGreater(summary['kernel_interactions_per_second'], 0)
+
+    def test_scenes_should_cover_charge_types_and_edge_cases(self):
+        scene_names = {record['scene'] for record in self._report['records']}
+        for name in CHARGE_TYPES + ('mixed',):
+            self.assertIn(f'{name}_3_12', scene_names)
+        for edge_case in EDGE_CASES:
+            self.assertIn(f'{edge_case}_9', scene_names)
+
+    def test_scenes_should_be_the_same_for_the_same_seed(self):
+        scenes = self._backend_matrix.scenes()
+        other_scenes = BackendMatrix(charge_counts=(1, 3), grid_sizes=(9, 12)).scenes()
+        for (_, __, charges), (___, ____, other_charges) in zip(scenes, other_scenes):
+            self.assertEqual([charge.q for charge in charges],
+                             [charge.q for charge in other_charges])
+
+    def test_edge_cases_should_have_singular_points(self):
+        config = ConfigOption(x_offset=0.3, elements_between_limits=9)
+        x, y = meshgrid(config.x_axis, config.y_axis)
+        on_charges = singular_points(x, y, edge_case_charges('on_charges', config))
+        collinear = singular_points(x, y, edge_case_charges('collinear', config))
+        self.assertEqual(on_charges.sum(), 2 + 4 + 2)
+        self.assertTrue(on_charges[1, 1] and on_charges[4, 3] and on_charges[6, 2])
+        self.assertEqual(collinear.sum(), 2 + 2 + 2)
+        self.assertFalse(collinear[3, 0] or collinear[3, 4] or collinear[3, 8])
+
+    def test_wrong_backend_should_fail(self):
+        report = BackendMatrix(backends={'shifted': _ShiftedElectricField},
+                               charge_types=('PointCharge',), charge_counts=(2,),
+                               grid_sizes=(9,), edge_cases=()).run()
+        self.assertFalse(report['passed'])
+        self.assertEqual(report['backends']['shifted']['failures'], 2)
+        self.assertAlmostEqual(report['backends']['shifted']['max_error'], 0.01, places=5)
+
+    def test_slower_backends_should_be_throughput_regressions(self):
+        baseline_report = {'backends': {
+            'sequential': {'interactions_per_second': 100, 'kernel_interactions_per_second': 200},
+            'parallel': {'interactions_per_second': 100, 'kernel_interactions_per_second': 200}}}
+        report = {'backends': {
+            'sequential': {'interactions_per_second': 50, 'kernel_interactions_per_second': 180},
+            'parallel': {'interactions_per_second': 90, 'kernel_interactions_per_second': 100}}}
+        self.assertEqual(throughput_regressions(report, baseline_report), {'parallel': 0.5})
@@ -0,0 +1,106 @@
+"""Unit test for CudaAutotuner."""
+import os
+import tempfile
+import time
+import unittest
+
+from electrostatics import LineCharge, PointCharge, PointChargeFlatland
+from numba import cuda
+from numpy import float32, ones, zeros
+from numpy.testing import assert_array_almost_equal
+
+from src.parallel_electric_field import (ParallelElectricField,
+                                         _calculate_electric_field_magnitudes)
+from src.sequential_electric_field import SequentialElectricField
+from src.helper.config_option import ConfigOption
+from src.helper.cuda_autotuner import (CudaAutotuner, candidate_blocks, grid_for_block,
+                                       occupancy_score)
+
+
+class TestCudaAutotuner(unittest.TestCase):
+    """Unit test for CudaAutotuner."""
+
+    def test_candidate_blocks_should_respect_the_number_of_kernels(self):
+        for number_of_kernels in [1, 16, 256, 1024]:
+            for block in candidate_blocks((200, 200, 3), number_of_kernels):
+                self.assertLessEqual(block[0] * block[1] * block[2], number_of_kernels)
+
+    def test_candidate_blocks_should_not_exceed_small_dimensions(self):
+        for block in candidate_blocks((200, 200, 3), 1024):
+            self.assertLessEqual(block[2], 4)
+
+    def test_candidate_blocks_should_start_with_the_best_occupancy(self):
+        shape = (200, 200, 3)
+        candidates = candidate_blocks(shape, 1024)
+        best_score = occupancy_score(shape, candidates[0])
+        for block in candidates:
+            self.assertLessEqual(occupancy_score(shape, block), best_score)
+
+    def test_grid_for_block_should_cover_the_shape(self):
+        self.assertEqual(grid_for_block((200, 300), (16, 32)), (13, 10))
+
+    def test_tune_should_store_the_fastest_block(self):
+        shape = (64, 64)
+        fastest_block = tuple(candidate_blocks(shape, 256)[3])
+
+        def launch(grid, block):
+            if tuple(block) != fastest_block:
+                time.sleep(0.002)
+
+        autotuner = CudaAutotuner(repeats=1, max_candidates=6)
+        block = autotuner.tune('kernel', shape, launch, 256)
+        self.assertEqual(tuple(block), fastest_block)
+        self.assertEqual(autotuner.table['kernel'], list(fastest_block))
+
+    def test_tuning_table_should_be_persisted_and_reloaded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            table_path = os.path.join(directory, 'tuning', 'table.json')
+            autotuner = CudaAutotuner(table_path, repeats=1, max_candidates=2)
+            autotuner.tune('kernel', (32, 32), lambda grid, block: None, 64)
+            reloaded_autotuner = CudaAutotuner(table_path)
+            self.assertEqual(reloaded_autotuner.table, autotuner.table)
+
+    def test_save_should_keep_the_entries_of_other_autotuners(self):
+        with tempfile.TemporaryDirectory() as directory:
+            table_path = os.path.join(directory, 'table.json')
+            autotuner = CudaAutotuner(table_path, repeats=1, max_candidates=2)
+            other_autotuner = CudaAutotuner(table_path, repeats=1, max_candidates=2)
+            autotuner.tune('kernel', (32, 32), lambda grid, block: None, 64)
+            other_autotuner.tune('other_kernel', (16, 16), lambda grid, block: None, 64)
+            self.assertEqual(set(CudaAutotuner(table_path).table), {'kernel', 'other_kernel'})
+            self.assertEqual(set(other_autotuner.table), {'kernel', 'other_kernel'})
+
+    def test_launch_args_should_look_up_the_tuning_table(self):
+        config = ConfigOption(x_min=-4, x_max=4, y_min=-3, y_max=3, elements_between_limits=16)
+        charges = [PointChargeFlatland(2, [0, 0]), PointCharge(-1, [2, 1])]
+        autotuner = CudaAutotuner(repeats=1, max_candidates=2)
+        parallel_electric_field = ParallelElectricField(config, charges, 64, autotuner)
+        parallel_electric_field.calculate()
+        table = dict(autotuner.table)
+        self.assertEqual(len(table), 2)
+        parallel_electric_field.calculate()
+        self.assertEqual(autotuner.table, table)
+
+    def test_launch_args_should_use_default_dimensions_with_kernel_args(self):
+        partial = ones((6, 10, 2, 2), dtype=float32)
+        result = zeros((6, 10), dtype=float32)
+        kernel_args = (cuda.to_device(partial), cuda.to_device(result))
+        autotuner = CudaAutotuner(repeats=1, max_candidates=2)
+        grid, block = autotuner.launch_args(_calculate_electric_field_magnitudes, result,
+                                            kernel_args)
+        self.assertEqual(len(block), 2)
+        self.assertTrue(all(g * b >= size for g, b, size in zip(grid, block, result.shape)))
+        self.assertEqual(len(autotuner.table), 1)
+
+    def test_tuned_launch_should_be_equal_to_sequential_results(self):
+        config = ConfigOption(x_min=-40, x_max=40, x_offset=2, y_min=-30, y_max=30, y_offset=0,
+                              zoom=6, elements_between_limits=24)
+        charges = [PointChargeFlatland(2, [0, 0]),
+                   PointCharge(-1, [2, 1]),
+                   LineCharge(1, [-1, -2], [-1, 2])]
+        sequential_electric_field = SequentialElectricField(config, charges)
+        sequential_result, _, __ = sequential_electric_field.calculate()
+        autotuner = CudaAutotuner(repeats=1, max_candidates=3)
+        parallel_electric_field = ParallelElectricField(config, charges, 256, autotuner)
+        parallel_result, _, __ = parallel_electric_field.calculate()
+        assert_array_almost_equal(sequential_result, parallel_result, decimal=5)
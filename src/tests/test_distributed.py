@@ -0,0 +1,120 @@
+"""Unit test for the distributed evaluation."""
+import socket
+import unittest
+from threading import Thread
+
+from electrostatics import LineCharge, PointChargeFlatland
+from numpy.testing import assert_array_almost_equal
+
+from src.distributed.coordinator import Coordinator
+from src.distributed.protocol import receive_message, send_message
+from src.distributed.worker import LocalWorkers, TileWorker
+from src.sequential_electric_field import SequentialElectricField
+from src.helper.config_option import ConfigOption
+from src.helper.segment_charges import Polygon
+
+
+class _FailingWorker():
+    """Worker that accepts the scene and then fails at each tile."""
+
+    def __init__(self, corrupt_tiles=False):
+        self._corrupt_tiles = corrupt_tiles
+        self._server = socket.create_server(('127.0.0.1', 0))
+        self.address = self._server.getsockname()
+        Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        connection, _ = self._server.accept()
+        with connection:
+            receive_message(connection)
+            send_message(connection, {'type': 'ready'})
+            header, _ = receive_message(connection)
+            if self._corrupt_tiles:
+                # Answers with a payload that is not zlib compressed.
+                send_message(connection, {'type': 'result', 'tile_id': header['tile_id'],
+                                          'shape': [8, 8], 'calculation_time': 0}, b'corrupt')
+                receive_message(connection)
+        self._server.close()
+
+
+class _LosingCoordinator(Coordinator):
+    """Coordinator that loses the first tile."""
+
+    def _store_tile(self, tile_id, tile, rows, columns, result, state):
+        if tile_id == 0:
+            with self._lock:
+                state['outstanding'] -= 1
+            return
+        super()._store_tile(tile_id, tile, rows, columns, result, state)
+
+
+class TestDistributed(unittest.TestCase):
+    """Unit test for the distributed evaluation."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._config = ConfigOption(x_min=-10, x_max=10, x_offset=0.5, y_min=-10, y_max=10,
+                                   elements_between_limits=30)
+        cls._charges = [PointChargeFlatland(2, [0.1, 0.1]),
+                        LineCharge(-1, [-3.1, -2.1], [-3.1, 2.1]),
+                        Polygon(1, [[2.1, 1.1], [4.1, 1.3], [3.3, 3.7]])]
+        cls._expected, _, __ = SequentialElectricField(cls._config, cls._charges).calculate()
+
+    def _start_thread_worker(self):
+        worker = TileWorker(backend='sequential')
+        Thread(target=worker.serve_forever, daemon=True).start()
+        self.addCleanup(worker.shutdown)
+        return worker.address
+
+    def test_tiles_should_cover_the_grid_once(self):
+        tiles = Coordinator([], tile_shape=(8, 12)).tiles(self._config)
+        covered = [[0] * 30 for _ in range(30)]
+        for _, (row_start, row_stop), (column_start, column_stop) in tiles:
+            for row in range(row_start, row_stop):
+                for column in range(column_start, column_stop):
+                    covered[row][column] += 1
+        self.assertEqual(len(tiles), 4 * 3)
+        self.assertTrue(all(count == 1 for row in covered for count in row))
+
+    def test_local_workers_results_should_be_equal_to_sequential_results(self):
+        with LocalWorkers(3, backend='sequential') as local_workers:
+            coordinator = Coordinator(local_workers.addresses, tile_shape=(8, 8))
+            result, _, __, report = coordinator.calculate(self._config, self._charges)
+        assert_array_almost_equal(result, self._expected, decimal=5)
+        self.assertEqual(len(report['workers']), 3)
+        self.assertEqual(sum(worker['tiles'] for worker in report['workers']), 16)
+        self.assertEqual(report['failed_workers'], 0)
+        self.assertGreater(report['load_balance'], 0)
+        self.assertGreater(report['compression_ratio'], 0)
+        for worker in report['workers']:
+            self.assertGreater(worker['points_per_second'], 0)
+
+    def test_tiles_of_failed_workers_should_be_reassigned(self):
+        with socket.create_server(('127.0.0.1', 0)) as closed_server:
+            unreachable_address = closed_server.getsockname()
+        workers = [_FailingWorker().address, unreachable_address, self._start_thread_worker()]
+        result, _, __, report = Coordinator(workers, tile_shape=(8, 8)).calculate(
+            self._config, self._charges)
+        assert_array_almost_equal(result, self._expected, decimal=5)
+        self.assertEqual(report['failed_workers'], 2)
+        self.assertEqual(report['workers'][2]['tiles'], 16)
+        self.assertEqual(report['load_balance'], 1)
+
+    def test_tiles_of_workers_with_corrupt_answers_should_be_reassigned(self):
+        workers = [_FailingWorker(corrupt_tiles=True).address, self._start_thread_worker()]
+        result, _, __, report = Coordinator(workers, tile_shape=(8, 8), timeout=5).calculate(
+            self._config, self._charges)
+        assert_array_almost_equal(result, self._expected, decimal=5)
+        self.assertEqual(report['failed_workers'], 1)
+        self.assertIn('error', report['workers'][0])
+
+    def test_lost_tiles_should_raise_runtime_error(self):
+        coordinator = _LosingCoordinator([self._start_thread_worker()], tile_shape=(8, 8),
+                                         timeout=5)
+        with self.assertRaises(RuntimeError):
+            coordinator.calculate(self._config, self._charges)
+
+    def test_failure_of_every_worker_should_raise_runtime_error(self):
+        with self.assertRaises(RuntimeError):
+            Coordinator([_FailingWorker().address], tile_shape=(8, 8)).calculate(
+                self._config, self._charges)
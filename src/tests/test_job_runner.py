@@ -0,0 +1,126 @@
+"""Unit test for JobRunner."""
+import json
+import os
+import tempfile
+import unittest
+
+from numpy import load
+from numpy.testing import assert_array_almost_equal
+
+from src.batch.job import Job
+from src.batch.job_runner import JobRunner
+from src.sequential_electric_field import SequentialElectricField
+
+
+class TestJobRunner(unittest.TestCase):
+    """Unit test for JobRunner."""
+
+    @classmethod
+    def setUpClass(cls):
+        config = {'x_min': -10, 'x_max': 10, 'y_min': -10, 'y_max': 10,
+                  'elements_between_limits': 20}
+        cls._jobs_as_dicts = [
+            {'id': 'flatland', 'config': config,
+             'charges': [{'type': 'PointChargeFlatland', 'q': 2, 'x': [0.1, 0.1]},
+                         {'type': 'PointChargeFlatland', 'q': -1, 'x': [2.1, 1.1]}]},
+            {'id': 'point', 'config': config,
+             'charges': [{'type': 'PointCharge', 'q': 1, 'x': [0.1, 0.1]}]},
+            {'config': config, 'backend': 'parallel',
+             'charges': [{'type': 'LineCharge', 'q': 1, 'x1': [-1.1, -2], 'x2': [-1.1, 2]}]},
+        ]
+
+    def _write_jobs_file(self, directory):
+        jobs_path = os.path.join(directory, 'jobs.jsonl')
+        with open(jobs_path, 'w') as jobs_file:
+            for job_as_dict in self._jobs_as_dicts:
+                jobs_file.write(json.dumps(job_as_dict) + '\n')
+        return jobs_path
+
+    def test_jobs_should_be_created_from_jsonl_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = Job.from_jsonl_file(self._write_jobs_file(directory))
+        self.assertEqual([job.job_id for job in jobs], ['flatland', 'point', 'job_2'])
+        self.assertEqual([len(job.charges) for job in jobs], [2, 1, 1])
+        self.assertEqual(jobs[2].backend, 'parallel')
+        self.assertEqual(jobs[0].config_option.elements_between_limits, 20)
+
+    def test_jobs_should_be_equal_after_dict_round_trip(self):
+        for job_as_dict in self._jobs_as_dicts:
+            job = Job.from_dict(job_as_dict, default_job_id='job')
+            round_trip_job = Job.from_dict(job.to_dict())
+            self.assertEqual(round_trip_job.job_id, job.job_id)
+            self.assertEqual(round_trip_job.backend, job.backend)
+            self.assertEqual(round_trip_job.config_option.to_dict(), job.config_option.to_dict())
+            self.assertEqual(round_trip_job.to_dict()['charges'], job.to_dict()['charges'])
+
+    def test_unknown_charge_type_should_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            Job.from_dict({'charges': [{'type': 'Dipole', 'q': 1}]})
+
+    def test_results_should_be_equal_to_sequential_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = Job.from_jsonl_file(self._write_jobs_file(directory))
+            output_dir = os.path.join(directory, 'results')
+            report = JobRunner(output_dir, processes=0, backend='sequential').run(jobs)
+            self.assertEqual(report['completed_jobs'], 3)
+            self.assertGreater(report['jobs_per_second'], 0)
+            for job in jobs:
+                electric_field = SequentialElectricField(job.config_option, job.charges)
+                expected, _, __ = electric_field.calculate()
+                stored = load(os.path.join(output_dir, f'{job.job_id}.npz'))
+                assert_array_almost_equal(stored['result'], expected, decimal=5)
+
+    def test_run_should_resume_skipping_completed_jobs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = Job.from_jsonl_file(self._write_jobs_file(directory))
+            output_dir = os.path.join(directory, 'results')
+            job_runner = JobRunner(output_dir, processes=0, backend='sequential')
+            job_runner.run(jobs[:2])
+            report = job_runner.run(jobs)
+            self.assertEqual(report['skipped_jobs'], 2)
+            self.assertEqual(report['completed_jobs'], 1)
+            self.assertEqual(job_runner.completed_jobs(), {'flatland', 'point', 'job_2'})
+
+    def test_run_should_ignore_index_entries_without_result_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = Job.from_jsonl_file(self._write_jobs_file(directory))
+            output_dir = os.path.join(directory, 'results')
+            job_runner = JobRunner(output_dir, processes=0, backend='sequential')
+            job_runner.run(jobs)
+            os.remove(os.path.join(output_dir, 'point.npz'))
+            with open(job_runner.index_path, 'a') as index_file:
+                index_file.write('{"job_id": "trunc')
+            self.assertEqual(job_runner.completed_jobs(), {'flatland', 'job_2'})
+
+    def test_run_after_a_truncated_index_line_should_register_new_jobs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = Job.from_jsonl_file(self._write_jobs_file(directory))
+            output_dir = os.path.join(directory, 'results')
+            job_runner = JobRunner(output_dir, processes=0, backend='sequential')
+            job_runner.run(jobs[:1])
+            with open(job_runner.index_path, 'a') as index_file:
+                index_file.write('{"job_id": "trunc')
+            job_runner.run(jobs)
+            self.assertEqual(job_runner.completed_jobs(), {'flatland', 'point', 'job_2'})
+
+    def test_unsafe_and_duplicate_job_ids_should_raise_value_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = Job.from_jsonl_file(self._write_jobs_file(directory))
+            job_runner = JobRunner(os.path.join(directory, 'results'), processes=0,
+                                   backend='sequential')
+            for job_id in ['../escaped', 'a/b', '..', '']:
+                with self.assertRaises(ValueError):
+                    job_runner.run([Job(job_id, jobs[0].config_option, jobs[0].charges)])
+            with self.assertRaises(ValueError):
+                job_runner.run([jobs[0], jobs[0]])
+            self.assertFalse(os.path.exists(os.path.join(directory, 'escaped.npz')))
+            self.assertEqual(job_runner.completed_jobs(), set())
+
+    def test_process_pool_should_run_every_job(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jobs = Job.from_jsonl_file(self._write_jobs_file(directory))
+            output_dir = os.path.join(directory, 'results')
+            report = JobRunner(output_dir, processes=2, backend='sequential').run(jobs)
+            self.assertEqual(report['completed_jobs'], 3)
+            for job in jobs:
+                self.assertTrue(os.path.exists(os.path.join(output_dir, f'{job.job_id}.npz')))
@@ -0,0 +1,108 @@
+"""Unit test for MutualInteraction."""
+import unittest
+from time import time
+
+from electrostatics import LineCharge, PointCharge, PointChargeFlatland
+from numpy import array, random
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from src.mutual_interaction import MutualInteraction
+from src.parallel_electric_field import ParallelElectricField
+from src.helper.config_option import ConfigOption
+
+
+class TestMutualInteraction(unittest.TestCase):
+    """Unit test for MutualInteraction."""
+
+    @staticmethod
+    def _random_charges(number_of_charges, seed=0):
+        generator = random.default_rng(seed)
+        charges = [PointCharge(generator.choice([-1, 1]), generator.uniform(-10, 10, 2))
+                   for _ in range(number_of_charges)]
+        charges += [PointChargeFlatland(1, [3, 3]), LineCharge(1, [-4, -2], [-4, 2])]
+        return charges
+
+    def test_all_pairs_forces_should_be_equal_to_the_charges_field(self):
+        charges = self._random_charges(50)
+        mutual_interaction = MutualInteraction(charges, softening=0)
+        expected = [charge.q * sum(other.E(charge.x) for other in charges if other is not charge)
+                    for charge in charges[:-1]]
+        assert_array_almost_equal(mutual_interaction.forces()[:-1], expected)
+        assert_array_almost_equal(mutual_interaction.forces()[-1], [0, 0])
+
+    def test_line_charge_forces_should_be_equal_to_the_line_charge_field(self):
+        line_charge = LineCharge(1.5, [-1, -0.5], [2, 1])
+        positions = [[3.5, 1.75001], [-7, -3.49], [0.5, 0.26], [0.3, -2.1], [2.2, 1.1]]
+        for position in positions:
+            charges = [PointChargeFlatland(1, position), line_charge]
+            forces = MutualInteraction(charges, softening=0).forces()
+            assert_array_almost_equal(forces[0], line_charge.E(position), decimal=8)
+
+    def test_cell_list_forces_should_be_equal_to_all_pairs_with_a_large_cutoff(self):
+        charges = self._random_charges(300)
+        all_pairs = MutualInteraction(charges)
+        cell_list = MutualInteraction(charges, method='cell_list', cutoff=30)
+        assert_array_almost_equal(all_pairs.forces(), cell_list.forces())
+
+    def test_cell_list_should_ignore_point_charges_beyond_the_cutoff(self):
+        charges = [PointCharge(1, [0, 0]), PointCharge(1, [5, 0]), PointCharge(1, [5.5, 0])]
+        cell_list = MutualInteraction(charges, method='cell_list', cutoff=1)
+        forces = cell_list.forces()
+        assert_array_almost_equal(forces[0], [0, 0])
+        self.assertLess(forces[1][0], 0)
+        self.assertGreater(forces[2][0], 0)
+
+    def test_cell_list_time_should_grow_linearly_at_constant_density(self):
+        def forces_time(number_of_charges):
+            generator = random.default_rng(0)
+            side = number_of_charges**0.5
+            charges = [PointCharge(1, generator.uniform(0, side, 2))
+                       for _ in range(number_of_charges)]
+            charges.append(LineCharge(1, [-1, 0], [-1, side]))
+            cell_list = MutualInteraction(charges, method='cell_list', cutoff=1)
+            cell_list.forces()
+            times = []
+            for _ in range(5):
+                start_time = time()
+                cell_list.forces()
+                times.append(time() - start_time)
+            return min(times)
+
+        # 8 times more charges, 8 times longer when linear and 64 times when quadratic.
+        self.assertLess(forces_time(32000) / forces_time(4000), 32)
+
+    def test_cell_list_without_cutoff_should_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            MutualInteraction(self._random_charges(2), method='cell_list')
+
+    def test_step_should_move_only_mobile_charges_and_update_the_scene(self):
+        charges = [PointCharge(1, [0, 0]), PointCharge(1, [1, 0]),
+                   LineCharge(1, [-1, -2], [-1, 2])]
+        mutual_interaction = MutualInteraction(charges, fixed=[0])
+        report = mutual_interaction.run(10, 0.01)
+        assert_array_almost_equal(charges[0].x, [0, 0])
+        assert_array_almost_equal(charges[2].x1, [-1, -2])
+        self.assertGreater(charges[1].x[0], 1)
+        assert_array_almost_equal(charges[1].x, mutual_interaction.positions[1])
+        self.assertEqual(report['charge_steps'], 10)
+
+    def test_relax_should_find_the_equilibrium_between_fixed_charges(self):
+        charges = [PointCharge(1, [-1, 0]), PointCharge(1, [1, 0]), PointCharge(1, [0.3, 0])]
+        mutual_interaction = MutualInteraction(charges, fixed=[0, 1])
+        report = mutual_interaction.relax(max_steps=1000, tolerance=1e-6, max_displacement=0.1)
+        self.assertTrue(report['converged'])
+        assert_array_almost_equal(charges[2].x, array([0, 0]), decimal=5)
+
+    def test_steps_should_update_the_field_map_of_the_electric_field(self):
+        config = ConfigOption(x_min=-3, x_max=3, x_offset=0.1, y_min=-3, y_max=3, y_offset=0.2,
+                              elements_between_limits=12)
+        charges = [PointChargeFlatland(1, [-0.5, 0.3]), PointChargeFlatland(1, [0.6, -0.4]),
+                   LineCharge(1, [-2.05, -1.05], [-2.05, 1.05])]
+        electric_field = ParallelElectricField(config, charges, 64)
+        initial_result, _, __ = electric_field.calculate()
+        mutual_interaction = MutualInteraction(charges, electric_field=electric_field)
+        mutual_interaction.run(5, 0.05)
+        result, _, __ = electric_field.calculate()
+        expected, _, __ = ParallelElectricField(config, charges, 64).calculate()
+        assert_array_equal(result, expected)
+        self.assertGreater(abs(result - initial_result).max(), 1e-3)
@@ -95,3 +95,29 @@ class TestParallelElectricField(unittest.TestCase):
         parallel_electric_field = ParallelElectricField(self._config, charges, 16)
         parallel_result, _, __ = parallel_electric_field.calculate()
         assert_array_almost_equal(original_result, parallel_result, decimal=5)
+
+    def test_progressive_levels_should_be_equal_to_sequential_results(self):
+        charges = [PointChargeFlatland(2, [0, 0]),
+                   PointCharge(-1, [2, 1]),
+                   LineCharge(1, [-1, -2], [-1, 2])]
+        sequential_electric_field = SequentialElectricField(self._config, charges)
+        sequential_result, _, __ = sequential_electric_field.calculate()
+        parallel_electric_field = ParallelElectricField(self._config, charges, 16)
+        strides = (8, 4, 2, 1)
+        levels = parallel_electric_field.calculate_progressive(strides)
+        for stride, (parallel_result, _, __) in zip(strides, levels):
+            assert_array_almost_equal(
+                sequential_result[::stride, ::stride], parallel_result, decimal=5)
+
+    def test_tiles_should_be_equal_to_sequential_results(self):
+        charges = [PointChargeFlatland(2, [0, 0]),
+                   PointCharge(-1, [2, 1]),
+                   LineCharge(1, [-1, -2], [-1, 2])]
+        sequential_electric_field = SequentialElectricField(self._config, charges)
+        sequential_result, _, __ = sequential_electric_field.calculate()
+        parallel_electric_field = ParallelElectricField(self._config, charges, 16)
+        rows, columns = slice(90, 105), slice(190, 200)
+        parallel_tile = parallel_electric_field.calculate_tile(rows, columns)
+        sequential_tile = sequential_electric_field.calculate_tile(rows, columns)
+        assert_array_almost_equal(sequential_result[rows, columns], parallel_tile, decimal=5)
+        assert_array_almost_equal(sequential_result[rows, columns], sequential_tile, decimal=5)
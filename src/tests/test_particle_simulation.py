@@ -0,0 +1,103 @@
+"""Unit test for ParticleSimulation."""
+import unittest
+
+from electrostatics import LineCharge, PointCharge, PointChargeFlatland
+from numpy import array, zeros
+from numpy.testing import assert_array_almost_equal
+
+from src.parallel_electric_field import ParallelElectricField
+from src.particle_simulation import ACTIVE, COLLIDED, ESCAPED, ParticleSimulation
+from src.sequential_electric_field import SequentialElectricField
+from src.helper.config_option import ConfigOption
+
+
+class TestParticleSimulation(unittest.TestCase):
+    """Unit test for ParticleSimulation."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._config = ConfigOption(x_min=-10, x_max=10, y_min=-10, y_max=10,
+                                   elements_between_limits=201)
+        cls._charges = [PointChargeFlatland(2, [0, 0]),
+                        PointCharge(-1, [3, 1]),
+                        LineCharge(1, [-4, -2], [-4, 2])]
+
+    def test_field_should_be_equal_to_the_charges_field(self):
+        electric_field = SequentialElectricField(self._config, self._charges)
+        positions = array([[1.5, 2.5], [-2, -1], [6, -3]])
+        simulation = ParticleSimulation(electric_field, positions, zeros((3, 2)))
+        expected = [sum(charge.E(position) for charge in self._charges) for position in positions]
+        assert_array_almost_equal(simulation.field(positions), expected, decimal=5)
+
+    def test_parallel_field_should_be_equal_to_sequential_field(self):
+        positions = array([[1.5, 2.5], [-2, -1], [6, -3], [0.2, -7]])
+        sequential_simulation = ParticleSimulation(
+            SequentialElectricField(self._config, self._charges), positions, zeros((4, 2)))
+        parallel_simulation = ParticleSimulation(
+            ParallelElectricField(self._config, self._charges, 16), positions, zeros((4, 2)))
+        assert_array_almost_equal(
+            sequential_simulation.field(positions), parallel_simulation.field(positions), decimal=5)
+
+    def test_interpolated_field_should_be_close_to_the_exact_field(self):
+        electric_field = SequentialElectricField(self._config, self._charges)
+        positions = array([[5.03, 5.07], [-7.01, 3.33], [6.5, -6.5]])
+        exact_simulation = ParticleSimulation(electric_field, positions, zeros((3, 2)))
+        interpolated_simulation = ParticleSimulation(
+            electric_field, positions, zeros((3, 2)), interpolate=True)
+        assert_array_almost_equal(exact_simulation.field(positions),
+                                  interpolated_simulation.field(positions), decimal=3)
+
+    def test_verlet_and_rk4_should_agree_for_small_time_steps(self):
+        electric_field = SequentialElectricField(self._config, self._charges)
+        positions = array([[2, 2], [-1, 3]])
+        velocities = array([[0.1, 0], [0, -0.1]])
+        verlet = ParticleSimulation(electric_field, positions, velocities, integrator='verlet')
+        rk4 = ParticleSimulation(electric_field, positions, velocities, integrator='rk4')
+        verlet.run(20, 0.01)
+        rk4.run(20, 0.01)
+        assert_array_almost_equal(verlet.positions, rk4.positions, decimal=4)
+        assert_array_almost_equal(verlet.velocities, rk4.velocities, decimal=3)
+
+    def test_test_charge_should_be_repelled_by_a_charge_of_same_sign(self):
+        charges = [PointChargeFlatland(1, [0, 0])]
+        electric_field = SequentialElectricField(self._config, charges)
+        simulation = ParticleSimulation(electric_field, [[1, 0]], [[0, 0]])
+        simulation.run(10, 0.05)
+        self.assertGreater(simulation.positions[0][0], 1)
+        self.assertAlmostEqual(simulation.positions[0][1], 0)
+
+    def test_test_charges_should_collide_and_escape(self):
+        charges = [PointChargeFlatland(1, [0, 0])]
+        electric_field = SequentialElectricField(self._config, charges)
+        positions = [[-1, 0], [9.9, 0], [0, 5]]
+        velocities = [[10, 0], [10, 0], [0, 0]]
+        simulation = ParticleSimulation(
+            electric_field, positions, velocities, charge_to_mass=[-1, 1, 0],
+            collision_radius=0.1)
+        report = simulation.run(100, 0.001)
+        self.assertEqual(list(simulation.status), [COLLIDED, ESCAPED, ACTIVE])
+        self.assertEqual(report['collided'], 1)
+        self.assertEqual(report['escaped'], 1)
+        self.assertEqual(report['active'], 1)
+        self.assertGreater(report['particle_steps_per_second'], 0)
+
+    def test_test_charges_crossing_a_charge_within_a_step_should_collide(self):
+        charges = [PointChargeFlatland(1, [0, 0]), LineCharge(1, [3, -1], [3, 1])]
+        electric_field = SequentialElectricField(self._config, charges)
+        positions = [[-1.5, 0.05], [2.4, 0.3], [-1.5, 2]]
+        velocities = [[10, 0], [10, 0], [10, 0]]
+        simulation = ParticleSimulation(
+            electric_field, positions, velocities, charge_to_mass=0, collision_radius=0.1)
+        simulation.step(0.3)
+        self.assertEqual(list(simulation.status), [COLLIDED, COLLIDED, ACTIVE])
+
+    def test_test_charges_with_non_finite_values_should_collide(self):
+        electric_field = SequentialElectricField(self._config, self._charges)
+        simulation = ParticleSimulation(electric_field, [[1, 1], [2, 2]],
+                                         [[float('nan'), 0], [0, 0]])
+        self.assertEqual(list(simulation.status), [COLLIDED, ACTIVE])
+
+    def test_unknown_integrator_should_raise_value_error(self):
+        electric_field = SequentialElectricField(self._config, self._charges)
+        with self.assertRaises(ValueError):
+            ParticleSimulation(electric_field, [[1, 1]], [[0, 0]], integrator='euler')
@@ -0,0 +1,96 @@
+"""Unit test for the segment charges."""
+import unittest
+
+from electrostatics import LineCharge, PointCharge, PointChargeFlatland
+from numpy import isfinite, pi
+from numpy.testing import assert_array_almost_equal
+
+from src.mutual_interaction import MutualInteraction
+from src.parallel_electric_field import ParallelElectricField
+from src.sequential_electric_field import SequentialElectricField
+from src.helper.charges_array import charges_to_array
+from src.helper.config_option import ConfigOption
+from src.helper.segment_charges import Arc, Polygon, Polyline
+
+
+class TestSegmentCharges(unittest.TestCase):
+    """Unit test for the segment charges."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._config = ConfigOption(x_min=-40, x_max=40, x_offset=2, y_min=-30, y_max=30, y_offset=0,
+                                   zoom=6, elements_between_limits=40)
+        cls._segment_charges = [
+            Polyline(2, [[-3.1, -2.1], [-1.1, 0.3], [0.1, -1.3], [1.7, 2.3]]),
+            Polygon(-1, [[2.3, 1.1], [4.1, 1.3], [3.3, 3.7]]),
+            Arc(1, [0.15, 0.2], 3.1, 0, pi, 16),
+        ]
+        cls._positions = [[0.3, 0.7], [-5.2, 3.1], [4.4, -2.2], [2.9, 1.9]]
+
+    def test_field_should_be_equal_to_equivalent_line_charges(self):
+        for segment_charge in self._segment_charges:
+            line_charges = segment_charge.to_line_charges()
+            for position in self._positions:
+                expected = sum(line_charge.E(position) for line_charge in line_charges)
+                assert_array_almost_equal(segment_charge.E(position), expected)
+
+    def test_equivalent_line_charges_should_have_the_same_total_charge(self):
+        for segment_charge in self._segment_charges:
+            line_charges = segment_charge.to_line_charges()
+            self.assertAlmostEqual(sum(line_charge.q for line_charge in line_charges),
+                                   segment_charge.q)
+            for line_charge in line_charges:
+                self.assertAlmostEqual(line_charge.lam, segment_charge.lam)
+
+    def test_polygon_and_arc_should_have_their_segments(self):
+        polygon, arc = self._segment_charges[1], self._segment_charges[2]
+        self.assertEqual(len(polygon.segments), 3)
+        assert_array_almost_equal(polygon.vertices[0], polygon.vertices[-1])
+        self.assertEqual(len(arc.segments), 16)
+        assert_array_almost_equal(arc.vertices[-1], [0.15 - 3.1, 0.2])
+
+    def test_charges_array_should_have_one_row_per_segment(self):
+        charges = [PointCharge(1, [0, 0])] + self._segment_charges
+        charges_array = charges_to_array(charges)
+        self.assertEqual(len(charges_array), 1 + 3 + 3 + 16)
+        self.assertTrue((charges_array[1:, 0] == 2).all())
+
+    def test_with_segment_charges_should_be_equal_to_line_charges_results(self):
+        line_charges = [line_charge for segment_charge in self._segment_charges
+                        for line_charge in segment_charge.to_line_charges()]
+        charges = [PointChargeFlatland(2, [0.1, 0.1])] + self._segment_charges
+        expanded_charges = [PointChargeFlatland(2, [0.1, 0.1])] + line_charges
+        expected, _, __ = SequentialElectricField(self._config, expanded_charges).calculate()
+        sequential_result, _, __ = SequentialElectricField(self._config, charges).calculate()
+        parallel_result, _, __ = ParallelElectricField(self._config, charges, 64).calculate()
+        assert_array_almost_equal(expected, sequential_result, decimal=5)
+        assert_array_almost_equal(expected, parallel_result, decimal=5)
+
+    def test_segment_charges_should_be_fixed_in_mutual_interaction(self):
+        polygon = Polygon(1, [[-1, -1], [1, -1], [1, 1], [-1, 1]])
+        charges = [polygon, PointCharge(1, [0.5, 0.2]), LineCharge(1, [3, -1], [3, 1])]
+        mutual_interaction = MutualInteraction(charges, masses=[1, 2, 1])
+        mutual_interaction.run(5, 0.01)
+        assert_array_almost_equal(polygon.vertices[0], [-1, -1])
+        assert_array_almost_equal(charges[1].x, mutual_interaction.positions[4])
+        self.assertNotAlmostEqual(charges[1].x[0], 0.5)
+
+    def test_polylines_need_enough_vertices(self):
+        with self.assertRaises(ValueError):
+            Polyline(1, [[0, 0]])
+        with self.assertRaises(ValueError):
+            Polyline(1, [[0, 0], [0, 0]])
+        with self.assertRaises(ValueError):
+            Polygon(1, [[0, 0], [1, 1]])
+        with self.assertRaises(ValueError):
+            Polygon(1, [[0, 0], [1, 1], [0, 0]])
+
+    def test_repeated_vertices_should_be_dropped(self):
+        polyline = Polyline(1, [[0, 0], [1, 0], [1, 0], [1, 1]])
+        polygon = Polygon(1, [[0, 0], [1, 0], [1, 1], [0, 0]])
+        self.assertEqual(len(polyline.segments), 2)
+        self.assertEqual(len(polygon.segments), 3)
+        for segment_charge in [polyline, polygon]:
+            self.assertTrue(isfinite(segment_charge.E([3, 3])).all())
+        assert_array_almost_equal(polygon.E([3, 3]),
+                                  Polygon(1, [[0, 0], [1, 0], [1, 1]]).E([3, 3]))
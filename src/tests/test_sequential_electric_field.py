@@ -1,4 +1,5 @@
 """Unit test for SequentialElectricField."""
+import threading
 import unittest
 
 from electrostatics import LineCharge, PointCharge, PointChargeFlatland
@@ -55,3 +56,42 @@ class TestSequentialElectricField(unittest.TestCase):
         sequential_electric_field = SequentialElectricField(self._config, charges)
         sequential_result, _, __ = sequential_electric_field.calculate()
         assert_array_almost_equal(original_result, sequential_result, decimal=5)
+
+    def test_progressive_levels_should_be_equal_to_full_resolution_results(self):
+        charges = [PointChargeFlatland(2, [0, 0]),
+                   PointCharge(-1, [2, 1]),
+                   LineCharge(1, [-1, -2], [-1, 2])]
+        sequential_electric_field = SequentialElectricField(self._config, charges)
+        sequential_result, _, __ = sequential_electric_field.calculate()
+        strides = (8, 4, 2, 1)
+        levels = list(sequential_electric_field.calculate_progressive(strides))
+        self.assertEqual(len(levels), len(strides))
+        for stride, (progressive_result, x, y) in zip(strides, levels):
+            self.assertEqual(progressive_result.shape, x.shape)
+            assert_array_almost_equal(
+                sequential_result[::stride, ::stride], progressive_result, decimal=5)
+
+    def test_progressive_levels_should_calculate_each_point_once(self):
+        charges = [PointChargeFlatland(2, [0, 0])]
+        sequential_electric_field = SequentialElectricField(self._config, charges)
+        calculated_points = []
+        field_vectors = sequential_electric_field.field_vectors
+
+        def counted_field_vectors(x, y):
+            calculated_points.append(x.size)
+            return field_vectors(x, y)
+
+        sequential_electric_field.field_vectors = counted_field_vectors
+        list(sequential_electric_field.calculate_progressive())
+        self.assertEqual(sum(calculated_points), 200 * 200)
+        self.assertEqual(calculated_points[0], 25 * 25)
+
+    def test_progressive_calculation_should_stop_when_cancelled(self):
+        charges = [PointChargeFlatland(2, [0, 0])]
+        sequential_electric_field = SequentialElectricField(self._config, charges)
+        cancel_event = threading.Event()
+        levels = []
+        for level in sequential_electric_field.calculate_progressive(cancel_event=cancel_event):
+            levels.append(level)
+            cancel_event.set()
+        self.assertEqual(len(levels), 1)
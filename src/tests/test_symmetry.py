@@ -0,0 +1,85 @@
+"""Unit test for the symmetry detection."""
+import unittest
+
+from electrostatics import LineCharge, PointCharge, PointChargeFlatland
+from numpy import arange
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from src.parallel_electric_field import ParallelElectricField
+from src.sequential_electric_field import SequentialElectricField
+from src.helper.charges_array import charges_to_array
+from src.helper.config_option import ConfigOption
+from src.helper.symmetry import (MIRROR_X, MIRROR_Y, ROTATION_180, GridSymmetry,
+                                 detect_symmetries, grid_symmetry)
+
+
+class TestSymmetry(unittest.TestCase):
+    """Unit test for the symmetry detection."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._config = ConfigOption(x_min=-10, x_max=10, x_offset=1, y_min=-8, y_max=8, y_offset=0,
+                                   zoom=2, elements_between_limits=41)
+
+    def test_dipole_should_have_every_symmetry(self):
+        charges = [PointChargeFlatland(1, [0, 0]), PointChargeFlatland(-1, [2, 0])]
+        center, symmetries = detect_symmetries(charges_to_array(charges))
+        assert_array_almost_equal(center, [1, 0])
+        self.assertEqual(symmetries, {MIRROR_X, MIRROR_Y, ROTATION_180})
+
+    def test_rotated_charges_should_only_have_rotation_symmetry(self):
+        charges = [PointCharge(1, [1, 2]), PointCharge(1, [-1, -2])]
+        _, symmetries = detect_symmetries(charges_to_array(charges))
+        self.assertEqual(symmetries, {ROTATION_180})
+
+    def test_line_charges_should_match_with_swapped_vertices(self):
+        charges = [LineCharge(1, [-1, -2], [-1, 2]), LineCharge(1, [1, 2], [1, -2])]
+        _, symmetries = detect_symmetries(charges_to_array(charges))
+        self.assertEqual(symmetries, {MIRROR_X, MIRROR_Y, ROTATION_180})
+
+    def test_mixed_charge_signs_should_not_be_symmetric(self):
+        charges = [PointCharge(1, [-1, 0]), PointCharge(1, [1, 0]),
+                   PointCharge(1, [0, -1]), PointCharge(-1, [0, 1])]
+        _, symmetries = detect_symmetries(charges_to_array(charges))
+        self.assertEqual(symmetries, {MIRROR_X})
+
+    def test_asymmetric_charges_should_not_be_symmetric(self):
+        charges = [PointChargeFlatland(2, [0, 0]), PointCharge(-1, [2, 1])]
+        _, symmetries = detect_symmetries(charges_to_array(charges))
+        self.assertEqual(symmetries, set())
+
+    def test_grid_symmetry_should_need_an_aligned_grid(self):
+        charges = [PointChargeFlatland(1, [0, 0]), PointChargeFlatland(-1, [2, 0])]
+        self.assertEqual(grid_symmetry(self._config, charges).symmetries,
+                         {MIRROR_X, MIRROR_Y, ROTATION_180})
+        shifted_charges = [PointChargeFlatland(1, [0, 1]), PointChargeFlatland(-1, [2, 1])]
+        self.assertEqual(grid_symmetry(self._config, shifted_charges).symmetries, {MIRROR_X})
+        self.assertIsNone(grid_symmetry(ConfigOption(x_offset=3, y_offset=2), charges))
+
+    def test_expand_should_mirror_the_fundamental_region(self):
+        for rows, columns in [(5, 7), (4, 6), (5, 6)]:
+            matrix = arange(rows * columns).reshape(rows, columns)
+            symmetric = matrix + matrix[::-1] + matrix[:, ::-1] + matrix[::-1, ::-1]
+            rotated = matrix + matrix[::-1, ::-1]
+            for symmetries, expected in [({MIRROR_X, MIRROR_Y, ROTATION_180}, symmetric),
+                                         ({MIRROR_X}, matrix + matrix[:, ::-1]),
+                                         ({MIRROR_Y}, matrix + matrix[::-1]),
+                                         ({ROTATION_180}, rotated)]:
+                grid = GridSymmetry(symmetries, (rows, columns))
+                region_rows, region_columns = grid.region_shape
+                assert_array_equal(grid.expand(expected[:region_rows, :region_columns]), expected)
+
+    def test_symmetric_results_should_be_equal_to_full_grid_results(self):
+        scenes = [[PointChargeFlatland(1, [0.1, 0]), PointChargeFlatland(-1, [1.9, 0])],
+                  [PointCharge(1, [0.1, 1]), PointCharge(-1, [1.9, -1])],
+                  [LineCharge(1, [0.1, -2], [0.1, 2]), LineCharge(-1, [1.9, 2], [1.9, -2]),
+                   PointChargeFlatland(-1, [0.6, 3]), PointChargeFlatland(1, [1.4, 3]),
+                   PointChargeFlatland(-1, [0.6, -3]), PointChargeFlatland(1, [1.4, -3])]]
+        for charges in scenes:
+            for electric_field_class in [SequentialElectricField, ParallelElectricField]:
+                full_result, full_x, full_y = electric_field_class(
+                    self._config, charges, use_symmetry=False).calculate()
+                symmetric_result, x, y = electric_field_class(self._config, charges).calculate()
+                assert_array_almost_equal(full_result, symmetric_result, decimal=5)
+                assert_array_equal(full_x, x)
+                assert_array_equal(full_y, y)
@@ -0,0 +1,97 @@
+"""Unit test for VolumeElectricField."""
+import os
+import tempfile
+import unittest
+
+from electrostatics import LineCharge, PointCharge, PointChargeFlatland
+from numpy import load, where
+from numpy.testing import assert_array_almost_equal
+
+from src.volume_electric_field import VolumeElectricField
+from src.helper.config_option import ConfigOption3D
+from src.helper.cuda_autotuner import CudaAutotuner
+
+
+class TestVolumeElectricField(unittest.TestCase):
+    """Unit test for VolumeElectricField."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._config = ConfigOption3D(x_min=-4, x_max=4, x_offset=0.5, y_min=-3, y_max=3,
+                                     y_offset=0, z_min=-2, z_max=2, z_offset=0,
+                                     elements_between_limits=11)
+        cls._charges = [PointCharge(2, [0.1, 0.1]),
+                        PointCharge(-1, [2.1, 1.1]),
+                        PointCharge(1, [-1.1, 0.3, 0.7])]
+
+    def test_plane_without_height_should_be_equal_to_point_charges_field(self):
+        charges = self._charges[:2]
+        volume, (x_axis, y_axis, z_axis) = VolumeElectricField(self._config, charges).calculate(
+            vectors=True)
+        plane = where(z_axis == 0)[0][0]
+        for j, y in enumerate(y_axis):
+            for k, x in enumerate(x_axis):
+                expected = sum(charge.E([x, y]) for charge in charges)
+                assert_array_almost_equal(volume[plane, j, k, :2], expected, decimal=4)
+                self.assertAlmostEqual(volume[plane, j, k, 2], 0)
+
+    def test_chunk_size_should_not_change_results(self):
+        volume, _ = VolumeElectricField(self._config, self._charges, chunk_size=1).calculate()
+        other_volume, _ = VolumeElectricField(self._config, self._charges, chunk_size=4).calculate()
+        assert_array_almost_equal(volume, other_volume)
+
+    def test_cuda_results_should_be_equal_to_numpy_results(self):
+        volume, _ = VolumeElectricField(self._config, self._charges).calculate()
+        cuda_volume, _ = VolumeElectricField(
+            self._config, self._charges, use_cuda=True, number_of_cores=64).calculate()
+        assert_array_almost_equal(volume, cuda_volume, decimal=5)
+
+    def test_tuned_cuda_results_should_be_equal_to_numpy_results(self):
+        volume, _ = VolumeElectricField(self._config, self._charges).calculate()
+        autotuner = CudaAutotuner(repeats=1, max_candidates=2)
+        cuda_volume, _ = VolumeElectricField(self._config, self._charges, use_cuda=True,
+                                             number_of_cores=64, autotuner=autotuner).calculate()
+        assert_array_almost_equal(volume, cuda_volume, decimal=5)
+        self.assertEqual(len(autotuner.table), 2)
+
+    def test_slices_should_be_equal_to_volume_planes(self):
+        volume_electric_field = VolumeElectricField(self._config, self._charges)
+        volume, (x_axis, y_axis, z_axis) = volume_electric_field.calculate()
+        x_slice, x_slice_axes = volume_electric_field.calculate_slice('x', 3)
+        y_slice, y_slice_axes = volume_electric_field.calculate_slice('y', 4)
+        z_slice, z_slice_axes = volume_electric_field.calculate_slice('z', 7)
+        assert_array_almost_equal(x_slice, volume[:, :, 3])
+        assert_array_almost_equal(y_slice, volume[:, 4, :])
+        assert_array_almost_equal(z_slice, volume[7])
+        assert_array_almost_equal(x_slice_axes[0], z_axis)
+        assert_array_almost_equal(y_slice_axes[1], x_axis)
+        assert_array_almost_equal(z_slice_axes[0], y_axis)
+
+    def test_volume_should_be_written_to_memory_mapped_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output_path = os.path.join(directory, 'volume.npy')
+            volume, _ = VolumeElectricField(self._config, self._charges, chunk_size=3).calculate(
+                output_path)
+            assert_array_almost_equal(load(output_path), volume)
+            del volume
+
+    def test_negative_slice_index_should_count_from_the_end(self):
+        volume_electric_field = VolumeElectricField(self._config, self._charges)
+        volume, _ = volume_electric_field.calculate()
+        x_slice, _ = volume_electric_field.calculate_slice('x', -1)
+        assert_array_almost_equal(x_slice, volume[:, :, -1])
+
+    def test_slice_index_out_of_the_axis_should_raise_value_error(self):
+        volume_electric_field = VolumeElectricField(self._config, self._charges)
+        for index in [11, -12]:
+            with self.assertRaises(ValueError):
+                volume_electric_field.calculate_slice('z', index)
+
+    def test_unknown_axis_should_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            VolumeElectricField(self._config, self._charges).calculate_slice('w', 0)
+
+    def test_flatland_and_line_charges_should_raise_value_error(self):
+        for charge in [PointChargeFlatland(1, [0, 0]), LineCharge(1, [0, 0], [1, 1])]:
+            with self.assertRaises(ValueError):
+                VolumeElectricField(self._config, [charge])
@@ -0,0 +1,182 @@
+"""
+Volumetric Electric Field of PointCharge scenes.
+
+The volume is calculated in chunks of z-planes, so the memory used by the calculation is bounded
+by the chunk size, and written to a (Z, Y, X) array that may be a memory-mapped .npy file.
+"""
+from time import time
+
+from electrostatics import PointCharge, PointChargeFlatland
+from numba import cuda
+from numpy import float32, log10, meshgrid, zeros
+from numpy.linalg import norm
+from numpy.lib.format import open_memmap
+
+from src.helper.cuda_helper import cuda_args
+
+AXES = ('x', 'y', 'z')
+
+
+class VolumeElectricField():
+    """
+    Volumetric Electric Field of 3-D point charges.
+    Args:
+        config_option(object): ConfigOption3D object with the configuration values.
+        charges(list): PointCharge objects, with 2-D (z = 0) or 3-D positions.
+        use_cuda(bool): calculate the chunks with the cuda kernel instead of numpy.
+        chunk_size(int): number of z-planes calculated at once.
+        number_of_cores(int): maximum number of threads per block of the cuda kernel.
+        autotuner(object): CudaAutotuner used to choose the block dimensions. If None, the blocks
+            are defined by cuda_args.
+    """
+
+    @property
+    def config_option(self):
+        """ConfigOption3D object with the configuration values."""
+        return self._config_option
+
+    def __init__(self, config_option, charges, use_cuda=False, chunk_size=8,
+                 number_of_cores=1024, autotuner=None):
+        self._config_option = config_option
+        self._charges = charges
+        self._charges_array = self._charges_to_array(charges)
+        self._use_cuda = use_cuda
+        self._chunk_size = chunk_size
+        self.number_of_cores = number_of_cores
+        self.autotuner = autotuner
+
+    def calculate(self, output_path=None, vectors=False):
+        """
+        Calculate the volume with Electric Field values.
+        Arguments:
+            output_path(str): .npy file of the memory-mapped volume, None keeps it in memory.
+            vectors(bool): store the (Ex, Ey, Ez) vectors instead of log10 of the magnitude.
+        Returns:
+            numpy.array: (Z, Y, X) volume, or (Z, Y, X, 3) with vectors.
+            tuple: x, y and z axes.
+        """
+        x_axis, y_axis, z_axis = self._axes()
+        shape = (len(z_axis), len(y_axis), len(x_axis)) + ((3,) if vectors else ())
+        if output_path is None:
+            volume = zeros(shape, dtype=float32)
+        else:
+            volume = open_memmap(output_path, mode='w+', dtype=float32, shape=shape)
+        for first_plane in range(0, len(z_axis), self._chunk_size):
+            last_plane = min(first_plane + self._chunk_size, len(z_axis))
+            volume[first_plane:last_plane] = self._calculate_block(
+                x_axis, y_axis, z_axis[first_plane:last_plane], vectors)
+        if output_path is not None:
+            volume.flush()
+        return volume, (x_axis, y_axis, z_axis)
+
+    def calculate_slice(self, axis, index, vectors=False):
+        """
+        Calculate a single axis-aligned plane of the volume.
+        Arguments:
+            axis(str): 'x', 'y' or 'z', axis normal to the plane.
+            index(int): index of the plane along the axis, negative values count from the end.
+            vectors(bool): return the (Ex, Ey, Ez) vectors instead of log10 of the magnitude.
+        Returns:
+            numpy.array: plane with calculated results, indexed by the two remaining axes in
+                (z, y, x) order.
+            tuple: axes of the plane rows and columns.
+        """
+        if axis not in AXES:
+            raise ValueError(f'Unknown axis {axis}, use one of {AXES}.')
+        axes = list(self._axes())
+        normal = AXES.index(axis)
+        length = len(axes[normal])
+        if not -length <= index < length:
+            raise ValueError(f'Index {index} out of the {axis}-axis with {length} elements.')
+        index %= length
+        axes[normal] = axes[normal][index:index + 1]
+        block = self._calculate_block(*axes, vectors)
+        # Block is indexed as (z, y, x), the plane axis is removed.
+        plane = block.take(0, axis=2 - normal)
+        plane_axes = tuple(axes[i] for i in (2, 1, 0) if i != normal)
+        return plane, plane_axes
+
+    def time_it(self, **kwargs):
+        """
+        Calculate the volume with Electric Field values.
+        Returns:
+            dict: total execution time and points per second.
+        """
+        start_time = time()
+        volume, _ = self.calculate()
+        total_time = time() - start_time
+        return {
+            'total_time': total_time,
+            'points_per_second': volume.size / total_time if total_time else 0,
+        }
+
+    def _axes(self):
+        return self._config_option.x_axis, self._config_option.y_axis, self._config_option.z_axis
+
+    def _calculate_block(self, x_axis, y_axis, z_axis, vectors):
+        if self._use_cuda:
+            field = self._calculate_cuda_field(x_axis, y_axis, z_axis)
+        else:
+            field = self._calculate_numpy_field(x_axis, y_axis, z_axis)
+        if vectors:
+            return field
+        return log10(norm(field, axis=-1))
+
+    def _calculate_numpy_field(self, x_axis, y_axis, z_axis):
+        z, y, x = meshgrid(z_axis, y_axis, x_axis, indexing='ij')
+        field = zeros(x.shape + (3,), dtype=float32)
+        for q, x0, y0, z0 in self._charges_array:
+            dx, dy, dz = x - x0, y - y0, z - z0
+            b = (dx**2 + dy**2 + dz**2)**1.5
+            field[..., 0] += q * dx / b
+            field[..., 1] += q * dy / b
+            field[..., 2] += q * dz / b
+        return field
+
+    def _calculate_cuda_field(self, x_axis, y_axis, z_axis):
+        field = zeros((len(z_axis), len(y_axis), len(x_axis), 3), dtype=float32)
+        kernel_args = (cuda.to_device(field), cuda.to_device(x_axis), cuda.to_device(y_axis),
+                       cuda.to_device(z_axis), cuda.to_device(self._charges_array))
+        grid, block = self._cuda_args(
+            _calculate_volume_electric_field_vectors, field, 3, *kernel_args)
+        # pylint: disable=E1136  # pylint/issues/3139
+        _calculate_volume_electric_field_vectors[grid, block](*kernel_args)
+        kernel_args[0].copy_to_host(field)
+        return field
+
+    def _cuda_args(self, kernel, matrix, dimensions, *kernel_args):
+        if self.autotuner is None:
+            return cuda_args(matrix, dimensions, self.number_of_cores)
+        return self.autotuner.launch_args(
+            kernel, matrix, kernel_args, dimensions, self.number_of_cores)
+
+    @staticmethod
+    def _charges_to_array(charges):
+        charges_array = zeros((len(charges), 4), dtype=float32)
+        for i, charge in enumerate(charges):
+            if not isinstance(charge, PointCharge) or isinstance(charge, PointChargeFlatland):
+                raise ValueError('Only PointCharge objects have a volumetric Electric Field.')
+            charges_array[i][0] = charge.q
+            charges_array[i][1] = charge.x[0]
+            charges_array[i][2] = charge.x[1]
+            charges_array[i][3] = charge.x[2] if len(charge.x) > 2 else 0
+        return charges_array
+
+
+@cuda.jit('void(float32[:,:,:,:], float32[:], float32[:], float32[:], float32[:,:])')
+def _calculate_volume_electric_field_vectors(field, x, y, z, charges):
+    i, j, k = cuda.grid(3)
+    if i >= field.shape[0] or j >= field.shape[1] or k >= field.shape[2]:
+        return
+
+    xp, yp, zp = x[k], y[j], z[i]
+    field_x, field_y, field_z = 0, 0, 0
+    for charge in charges:
+        q, dx, dy, dz = charge[0], xp - charge[1], yp - charge[2], zp - charge[3]
+        b = (dx**2 + dy**2 + dz**2)**1.5
+        field_x += q * dx / b
+        field_y += q * dy / b
+        field_z += q * dz / b
+    field[i][j][k][0] = field_x
+    field[i][j][k][1] = field_y
+    field[i][j][k][2] = field_z